@@ -19,8 +19,7 @@ Requisitos:
 """
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -28,9 +27,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from .common import (
-    require_credential, 
-    decrypt_fernet, 
-    normalize_currency,
+    Account,
+    load_creds,
+    normalize_currency_symbol,
     parse_amount,
     now_iso,
 )
@@ -85,6 +84,15 @@ Cada campo es un diccionario con:
 - min_len (int, opcional): Longitud mínima del valor
 """
 
+BANK_HOST = "portal.mibanco.com"
+"""
+Host del portal (opcional).
+
+main.py ejecuta los bancos en paralelo, pero serializa los que declaran
+el mismo BANK_HOST para no abrir sesiones simultáneas contra un mismo
+portal. Si se omite, se usa BANK_KEY.
+"""
+
 # URL de login del portal
 LOGIN_URL = "https://portal.mibanco.com/login"
 """URL de inicio de sesión del portal."""
@@ -111,6 +119,27 @@ SEL_ACCOUNTS_CONTAINER = (By.ID, "accounts-container")
 SEL_ACCOUNT_ROWS = (By.CSS_SELECTOR, ".account-row")
 """Selector para cada fila/tarjeta de cuenta."""
 
+SEL_ACCOUNT_CELLS = (By.CSS_SELECTOR, ".account-cell")
+"""Selector para cada celda dentro de una fila (número, moneda, saldo)."""
+
+
+# =============================================================================
+# SCRIPTS JS
+# =============================================================================
+
+JS_READ_ROWS = """
+const [container, rowSel, cellSel] = arguments;
+return Array.from(container.querySelectorAll(rowSel)).map(
+    r => Array.from(r.querySelectorAll(cellSel)).map(c => (c.textContent || '').trim())
+);
+"""
+"""
+Lee todas las filas como lista de listas de textos en un solo round-trip.
+
+Preferir esto a iterar WebElements y leer .text por celda: cada .text es
+un round-trip a geckodriver que además calcula visibilidad y texto renderizado.
+"""
+
 
 # =============================================================================
 # CONFIGURACIÓN INTERNA (NO MODIFICAR)
@@ -131,7 +160,7 @@ class MiBancoCreds:
     """
     Credenciales de acceso al portal.
     
-    Ajustar campos según CREDENTIAL_FIELDS.
+    Los nombres de los campos deben coincidir con los "name" de CREDENTIAL_FIELDS.
     Usar frozen=True para inmutabilidad.
     """
     document: str
@@ -158,22 +187,7 @@ def _get_creds() -> MiBancoCreds:
         RuntimeError: Si el archivo no existe, JSON inválido,
                       o faltan campos requeridos.
     """
-    raw = require_credential(REQUIRED_CREDENTIALS["creds"])
-    json_text = decrypt_fernet(raw)
-    
-    try:
-        obj = json.loads(json_text)
-    except Exception as e:
-        raise RuntimeError(f"JSON inválido en {REQUIRED_CREDENTIALS['creds']}: {e}")
-
-    # Extraer campos (ajustar según CREDENTIAL_FIELDS)
-    doc = (obj.get("document") or "").strip()
-    pwd = (obj.get("password") or "").strip()
-    
-    if not doc or not pwd:
-        raise RuntimeError("Faltan campos document/password en las credenciales")
-    
-    return MiBancoCreds(document=doc, password=pwd)
+    return load_creds(REQUIRED_CREDENTIALS["creds"], CREDENTIAL_FIELDS, MiBancoCreds)
 
 
 # =============================================================================
@@ -200,6 +214,8 @@ def login(driver: WebDriver, wait: WebDriverWait, creds: MiBancoCreds) -> None:
         TimeoutException: Si algún elemento no aparece a tiempo.
         NoSuchElementException: Si un selector está mal.
     """
+    # driver.get() no espera la carga completa (pageLoadStrategy "none"):
+    # siempre esperar explícitamente los elementos antes de usarlos.
     driver.get(LOGIN_URL)
 
     # Completar campo usuario/documento
@@ -224,13 +240,13 @@ def login(driver: WebDriver, wait: WebDriverWait, creds: MiBancoCreds) -> None:
     pass
 
 
-def extract_accounts(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
+def extract_accounts(driver: WebDriver, wait: WebDriverWait) -> list[Account]:
     """
     Extrae información de cuentas.
     
     Pasos típicos:
         1. Esperar a que cargue el contenedor de cuentas
-        2. Iterar sobre cada cuenta/tarjeta
+        2. Leer todas las filas/celdas con un único execute_script (JS_READ_ROWS)
         3. Extraer: número, moneda, saldo, disponible
         4. Normalizar datos con funciones de common.py
     
@@ -239,7 +255,7 @@ def extract_accounts(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
         wait: WebDriverWait configurado con timeout.
         
     Returns:
-        Lista de diccionarios con formato estándar:
+        Lista de Account con formato estándar:
         - type: "ACCOUNT" o "CREDIT_CARD"
         - currency: "UYU", "USD", "EUR", etc.
         - account_number: Identificador de la cuenta
@@ -252,32 +268,32 @@ def extract_accounts(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
     # Esperar contenedor
     container = wait.until(EC.presence_of_element_located(SEL_ACCOUNTS_CONTAINER))
     
-    # Obtener filas de cuentas
-    rows = container.find_elements(*SEL_ACCOUNT_ROWS)
+    # Obtener textos de todas las filas en un solo round-trip
+    rows = driver.execute_script(
+        JS_READ_ROWS, container, SEL_ACCOUNT_ROWS[1], SEL_ACCOUNT_CELLS[1]
+    ) or []
     
-    for row in rows:
+    for cells in rows:
         try:
-            # EJEMPLO: Ajustar selectores según el sitio
-            # acc_number = row.find_element(By.CLASS_NAME, "account-number").text
-            # currency_text = row.find_element(By.CLASS_NAME, "currency").text
-            # balance_text = row.find_element(By.CLASS_NAME, "balance").text
+            # EJEMPLO: Ajustar índices según las columnas del sitio
+            # acc_number, currency_text, balance_text = cells[:3]
             
             # Datos de ejemplo (REEMPLAZAR)
-            acc_number = "Cuenta 12345"
+            acc_number = "<ACCOUNT>"
             currency_text = "Pesos"
-            balance_text = "1.234,56"
+            balance_text = "<AMOUNT>"
             
             # Normalizar datos usando funciones de common.py
             balance_obj = parse_amount(balance_text)
             
-            accounts.append({
-                "type": "ACCOUNT",
-                "currency": normalize_currency(currency_text),
-                "account_number": acc_number,
-                "balance": balance_obj,
-                "available": balance_obj,  # O extraer por separado si aplica
-                "logo": BANK_LOGO,
-            })
+            accounts.append(Account(
+                type="ACCOUNT",
+                currency=normalize_currency_symbol(currency_text),
+                account_number=acc_number,
+                balance=balance_obj,
+                available=balance_obj,  # O extraer por separado si aplica
+                logo=BANK_LOGO,
+            ))
         except Exception:
             # Loguear error pero continuar con otras cuentas
             continue
@@ -328,5 +344,5 @@ def run(driver: WebDriver, env: dict[str, str]) -> dict:
     # 3. Retornar en formato estándar
     return {
         "updated_at": now_iso(),
-        "accounts": accounts,
+        "accounts": [asdict(a) for a in accounts],
     }
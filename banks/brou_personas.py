@@ -10,8 +10,7 @@ Uso:
 """
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -19,11 +18,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from .common import (
-    require_credential, 
-    decrypt_fernet, 
-    normalize_currency,
+    Account,
+    load_creds,
+    normalize_currency_symbol,
     parse_amount,
     now_iso,
+    fill_inputs,
+    wait_for,
 )
 
 # =============================================================================
@@ -58,8 +59,17 @@ SEL_PWD_INPUT = (By.NAME, "password")
 SEL_SUBMIT_BTN = (By.CSS_SELECTOR, "button[type='submit']")
 """Botón de envío del formulario de login."""
 
-SEL_TABLE_CONTAINER = (By.XPATH, "/html/body/div[1]/div[1]/div/div/div/div/div/main/div[1]/div/div/div[2]/section/div/div/div/div/div/div[2]/div[2]")
-"""Contenedor principal de la tabla de saldos."""
+SEL_TABLE_CONTAINER = (
+    By.CSS_SELECTOR,
+    "body > div:nth-of-type(1) > div:nth-of-type(1) > div > div > div > div > div > main"
+    " > div:nth-of-type(1) > div > div > div:nth-of-type(2) > section > div > div > div"
+    " > div > div > div:nth-of-type(2) > div:nth-of-type(2)",
+)
+"""Cuerpo de la tabla de saldos.
+   Traducción exacta a CSS (querySelector nativo) del XPath absoluto
+   /html/body/div[1]/div[1]/div/div/div/div/div/main/div[1]/div/div/div[2]/
+   section/div/div/div/div/div/div[2]/div[2]: apunta al mismo nodo por
+   posición, así que también se rompe ante cambios de layout."""
 
 SEL_TABLE_ROWS = (By.CSS_SELECTOR, "div.table-body a.table-row")
 """Filas de la tabla (cada fila es una cuenta)."""
@@ -67,6 +77,27 @@ SEL_TABLE_ROWS = (By.CSS_SELECTOR, "div.table-body a.table-row")
 SEL_TABLE_CELLS = (By.CSS_SELECTOR, "div.table-data")
 """Celdas dentro de cada fila (cuenta, moneda, saldo)."""
 
+# =============================================================================
+# SCRIPTS JS
+# =============================================================================
+
+JS_READ_ROWS = """
+const [container, rowSel, cellSel] = arguments;
+return Array.from(container.querySelectorAll(rowSel)).map(
+    r => Array.from(r.querySelectorAll(cellSel)).map(c => (c.textContent || '').trim())
+);
+"""
+"""Lee todas las filas de la tabla de saldos como lista de listas de textos."""
+
+JS_COUNT_ROWS = "return arguments[0].querySelectorAll(arguments[1]).length;"
+"""Cuenta las filas cargadas en la tabla de saldos."""
+
+WAIT_TIMEOUT = 60
+"""Timeout (segundos) de las esperas explícitas."""
+
+WAIT_POLL = 0.1
+"""Intervalo de polling (segundos) de las esperas explícitas."""
+
 REQUIRED_CREDENTIALS = {
     "creds": f"{BANK_KEY}_creds",
 }
@@ -102,21 +133,7 @@ def _get_creds() -> BrouCreds:
         RuntimeError: Si el archivo no existe, no es JSON válido,
                       o faltan campos requeridos.
     """
-    raw = require_credential(REQUIRED_CREDENTIALS["creds"])
-    json_text = decrypt_fernet(raw)
-
-    try:
-        obj = json.loads(json_text)
-    except Exception as e:
-        raise RuntimeError(f"El credential {REQUIRED_CREDENTIALS['creds']} no es un JSON válido: {e}")
-
-    doc = (obj.get("document") or "").strip()
-    pwd = (obj.get("password") or "").strip()
-
-    if not doc or not pwd:
-        raise RuntimeError(f"El credential {REQUIRED_CREDENTIALS['creds']} debe incluir 'document' y 'password'")
-
-    return BrouCreds(document=doc, password=pwd)
+    return load_creds(REQUIRED_CREDENTIALS["creds"], CREDENTIAL_FIELDS, BrouCreds)
 
 
 # =============================================================================
@@ -127,44 +144,45 @@ def login(driver: WebDriver, wait: WebDriverWait, creds: BrouCreds) -> None:
     """
     Realiza el proceso de autenticación en el portal BROU.
     
-    Navega a la página de login, completa el formulario con las
-    credenciales proporcionadas y envía el formulario.
+    Completa el formulario con las credenciales proporcionadas (un único
+    execute_script para ambos campos) y envía el formulario. Asume que el
+    driver ya navegó a BROU_URL (run() lo hace mientras descifra las
+    credenciales).
     
     Args:
         driver: Instancia del WebDriver de Selenium.
         wait: WebDriverWait configurado con timeout.
         creds: Credenciales de acceso.
     """
-    driver.get(BROU_URL)
-
-    # Esperar y completar campo documento
-    doc_input = wait.until(EC.presence_of_element_located(SEL_DOC_INPUT))
-    doc_input.clear()
-    doc_input.send_keys(creds.document)
+    # Esperar a que ambos campos estén presentes (una sola espera)
+    doc_input, pwd_input = wait.until(EC.all_of(
+        EC.presence_of_element_located(SEL_DOC_INPUT),
+        EC.presence_of_element_located(SEL_PWD_INPUT),
+    ))
 
-    # Esperar y completar campo contraseña
-    pwd_input = wait.until(EC.presence_of_element_located(SEL_PWD_INPUT))
-    pwd_input.clear()
-    pwd_input.send_keys(creds.password)
+    # Completar ambos campos en un solo round-trip
+    fill_inputs(driver, [doc_input, pwd_input], [creds.document, creds.password])
 
     # Enviar formulario
     submit_btn = wait.until(EC.element_to_be_clickable(SEL_SUBMIT_BTN))
     submit_btn.click()
 
 
-def extract_accounts(wait: WebDriverWait) -> list[dict]:
+def extract_accounts(driver: WebDriver, wait: WebDriverWait) -> list[Account]:
     """
     Extrae información de cuentas desde la tabla de saldos.
     
-    Espera a que la tabla de saldos esté visible y cargada,
-    luego itera sobre cada fila extrayendo: número de cuenta,
-    moneda y saldo disponible.
+    Espera a que la tabla de saldos esté visible y cargada, y luego
+    lee todas las filas con un único execute_script (en lugar de un
+    round-trip a geckodriver por cada celda), extrayendo: número de
+    cuenta, moneda y saldo disponible.
     
     Args:
+        driver: Instancia del WebDriver de Selenium.
         wait: WebDriverWait configurado con timeout.
         
     Returns:
-        Lista de diccionarios con la información de cada cuenta:
+        Lista de Account con la información de cada cuenta:
         - type: Tipo de cuenta ("ACCOUNT")
         - currency: Símbolo de moneda normalizado
         - account_number: Identificador de la cuenta
@@ -172,37 +190,37 @@ def extract_accounts(wait: WebDriverWait) -> list[dict]:
         - available: Disponible como objeto {raw, number}
         - logo: Nombre del archivo de logo
     """
-    # Esperar contenedor de tabla
-    table_container = wait.until(EC.presence_of_element_located(SEL_TABLE_CONTAINER))
+    # Esperar contenedor de tabla (transición post-login, polling con backoff)
+    table_container = wait_for(driver, SEL_TABLE_CONTAINER, timeout=WAIT_TIMEOUT)
     
-    # Esperar a que haya al menos una fila cargada
-    wait.until(lambda d: len(table_container.find_elements(*SEL_TABLE_ROWS)) > 0)
+    # Esperar a que haya al menos una fila cargada (un round-trip JS por poll)
+    wait.until(lambda d: d.execute_script(JS_COUNT_ROWS, table_container, SEL_TABLE_ROWS[1]) > 0)
     
-    rows = table_container.find_elements(*SEL_TABLE_ROWS)
+    rows = driver.execute_script(
+        JS_READ_ROWS, table_container, SEL_TABLE_ROWS[1], SEL_TABLE_CELLS[1]
+    ) or []
     accounts = []
 
-    for row in rows:
-        cells = row.find_elements(*SEL_TABLE_CELLS)
-        
+    for cells in rows:
         # Validar que la fila tenga las 3 columnas esperadas
         if len(cells) < 3:
             continue
 
-        cuenta_text = cells[0].text.strip()   # Ej: "CA (001234567-00001)"
-        moneda_text = cells[1].text.strip()   # Ej: "Pesos" o "Dólares"
-        saldo_text = cells[2].text.strip()    # Ej: "1.234,56"
+        cuenta_text = cells[0]   # Ej: "CA (<ACCOUNT>)"
+        moneda_text = cells[1]   # Ej: "Pesos" o "Dólares"
+        saldo_text = cells[2]    # Ej: "<AMOUNT>"
 
         # En BROU, el saldo mostrado es el disponible
         balance_obj = parse_amount(saldo_text)
         
-        accounts.append({
-            "type": "ACCOUNT",
-            "currency": normalize_currency(moneda_text),
-            "account_number": cuenta_text,
-            "balance": balance_obj,
-            "available": balance_obj,
-            "logo": BANK_LOGO,
-        })
+        accounts.append(Account(
+            type="ACCOUNT",
+            currency=normalize_currency_symbol(moneda_text),
+            account_number=cuenta_text,
+            balance=balance_obj,
+            available=balance_obj,
+            logo=BANK_LOGO,
+        ))
     
     return accounts
 
@@ -228,16 +246,21 @@ def run(driver: WebDriver, env: dict[str, str]) -> dict:
         - updated_at: Timestamp ISO de la extracción
         - accounts: Lista de cuentas extraídas
     """
+    # Con pageLoadStrategy "none" driver.get() retorna enseguida: el
+    # descifrado de credenciales se solapa con la carga de la página de login
+    driver.get(BROU_URL)
     creds = _get_creds()
-    wait = WebDriverWait(driver, 60)
+
+    # Solo esperas explícitas (main.py desactiva el implicit wait), con polling corto
+    wait = WebDriverWait(driver, WAIT_TIMEOUT, poll_frequency=WAIT_POLL)
 
     # 1. Autenticación
     login(driver, wait, creds)
 
     # 2. Extracción de saldos
-    accounts = extract_accounts(wait)
+    accounts = extract_accounts(driver, wait)
 
     return {
         "updated_at": now_iso(),
-        "accounts": accounts,
+        "accounts": [asdict(a) for a in accounts],
     }
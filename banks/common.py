@@ -7,20 +7,54 @@ de scraping, incluyendo:
 - Lectura y desencriptación de credenciales
 - Normalización de monedas
 - Parseo de montos en formato uruguayo
+- Helpers de interacción con el DOM vía JavaScript
 
 Todas las funciones están diseñadas para ser importadas por los módulos
 específicos de cada banco (brou_personas.py, oca.py, etc.).
 """
 from __future__ import annotations
 
+import json
 import os
 import re
-from datetime import datetime, timezone, timedelta
-from pathlib import Path
-from typing import Any, Literal
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from datetime import datetime, timezone, timedelta, tzinfo
+from typing import Any, Literal, TypeVar
 from zoneinfo import ZoneInfo
 
 from cryptography.fernet import Fernet, InvalidToken
+from selenium.common.exceptions import TimeoutException
+
+
+# =============================================================================
+# TIPOS DE DATOS
+# =============================================================================
+
+@dataclass(slots=True)
+class Account:
+    """
+    Cuenta o tarjeta extraída por un scraper.
+    
+    Los scrapers acumulan instancias de Account y las convierten a dict
+    (dataclasses.asdict) recién al retornar de run(), que es el formato
+    que consumen main.py, el JSON de salida y MQTT.
+    
+    Attributes:
+        type: "ACCOUNT" o "CREDIT_CARD".
+        currency: Moneda normalizada (ver normalize_currency()).
+        account_number: Identificador de la cuenta o tarjeta.
+        balance: Saldo/consumos como {"raw": str, "number": float|None}.
+        available: Disponible como {"raw": str|None, "number": float|None}.
+        logo: Nombre del archivo de logo en bank-logos/.
+    """
+    type: str
+    currency: str
+    account_number: str
+    balance: dict[str, Any]
+    available: dict[str, Any]
+    logo: str
 
 
 # =============================================================================
@@ -34,15 +68,19 @@ DEFAULT_TIMEZONE = "America/Montevideo"
 UY_TZ = timezone(timedelta(hours=-3))
 
 
-def get_timezone() -> timezone:
+@lru_cache(maxsize=1)
+def get_timezone() -> tzinfo:
     """
     Obtiene el timezone configurado desde la variable de entorno TZ.
     
     Intenta usar ZoneInfo para soporte completo de DST (horario de verano).
     Si el timezone no es válido, retorna UTC-3 como fallback.
     
+    El resultado se cachea: TZ se lee una sola vez por proceso. Si TZ
+    cambia en runtime, llamar a get_timezone.cache_clear().
+    
     Returns:
-        timezone: Objeto timezone para usar con datetime.
+        tzinfo: Objeto timezone para usar con datetime.
         
     Example:
         >>> tz = get_timezone()
@@ -74,6 +112,31 @@ def now_iso() -> str:
 # MANEJO DE CREDENCIALES
 # =============================================================================
 
+def read_credential_bytes(name: str) -> bytes:
+    """
+    Lee un secreto desde el directorio de credenciales, en bytes.
+    
+    Los credentials cifrados son base64 ASCII, así que pueden pasarse
+    directo a decrypt_fernet() sin decodificar/re-codificar UTF-8.
+    
+    Args:
+        name: Nombre del archivo de credencial a leer.
+        
+    Returns:
+        bytes: Contenido del archivo (sin espacios al inicio/fin),
+               o b"" si no existe.
+    """
+    cred_dir = os.environ.get("CREDENTIALS_DIRECTORY")
+    if not cred_dir:
+        return b""
+    # EAFP: un solo open() en lugar de stat + open (open ya usa O_CLOEXEC)
+    try:
+        with open(os.path.join(cred_dir, name), "rb") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return b""
+
+
 def read_credential(name: str) -> str:
     """
     Lee un secreto desde el directorio de credenciales.
@@ -91,13 +154,7 @@ def read_credential(name: str) -> str:
         Esta función no lanza excepciones si el archivo no existe.
         Para requerir que exista, usar require_credential().
     """
-    cred_dir = os.environ.get("CREDENTIALS_DIRECTORY")
-    if not cred_dir:
-        return ""
-    p = Path(cred_dir) / name
-    if not p.exists():
-        return ""
-    return p.read_text(encoding="utf-8").strip()
+    return read_credential_bytes(name).decode("utf-8").strip()
 
 
 def require_credential(name: str) -> str:
@@ -121,15 +178,54 @@ def require_credential(name: str) -> str:
     return v
 
 
-def decrypt_fernet(encrypted_data: str, *, env_key_name: str = "CREDS_KEY") -> str:
+def require_credential_bytes(name: str) -> bytes:
+    """
+    Lee un secreto en bytes o lanza error si no existe.
+    
+    Variante de require_credential() para alimentar decrypt_fernet()
+    sin pasar por str.
+    
+    Args:
+        name: Nombre del archivo de credencial a leer.
+        
+    Returns:
+        bytes: Contenido del archivo de credencial.
+        
+    Raises:
+        RuntimeError: Si el archivo no existe o está vacío.
+    """
+    v = read_credential_bytes(name)
+    if not v:
+        raise RuntimeError(f"Falta el credential requerido: {name}")
+    return v
+
+
+@lru_cache(maxsize=4)
+def _cipher(key: bytes) -> Fernet:
+    """
+    Construye (y memoiza) el cipher Fernet para una clave.
+    
+    Args:
+        key: Clave Fernet en bytes.
+        
+    Returns:
+        Fernet: Cipher listo para descifrar.
+    """
+    return Fernet(key)
+
+
+def decrypt_fernet(encrypted_data: bytes | str, *, env_key_name: str = "CREDS_KEY") -> str:
     """
     Descifra credenciales usando Fernet (AES-128-CBC + HMAC).
     
     Fernet proporciona cifrado autenticado, garantizando tanto
-    confidencialidad como integridad de los datos.
+    confidencialidad como integridad de los datos. El cipher se memoiza
+    por clave; el texto descifrado no se cachea, para no retener
+    credenciales en memoria más allá de cada llamada.
     
     Args:
         encrypted_data: Datos cifrados en formato Fernet (URL-safe base64).
+                        Si ya vienen en bytes se usan tal cual.
         env_key_name: Nombre de la variable de entorno con la clave.
                       Por defecto "CREDS_KEY".
     
@@ -149,8 +245,9 @@ def decrypt_fernet(encrypted_data: str, *, env_key_name: str = "CREDS_KEY") -> s
         raise RuntimeError(f"Falta la clave {env_key_name} en el archivo .env")
 
     try:
-        cipher = Fernet(key)
-        return cipher.decrypt(encrypted_data.encode("utf-8")).decode("utf-8")
+        if isinstance(encrypted_data, str):
+            encrypted_data = encrypted_data.encode("utf-8")
+        return _cipher(key).decrypt(encrypted_data).decode("utf-8")
     except ValueError:
         raise RuntimeError(
             "CREDS_KEY no es una clave Fernet válida. "
@@ -165,10 +262,149 @@ def decrypt_fernet(encrypted_data: str, *, env_key_name: str = "CREDS_KEY") -> s
         raise RuntimeError(f"Error al descifrar: {e}")
 
 
+T = TypeVar("T")
+
+
+def load_creds(cred_name: str, fields: list[dict], cls: type[T]) -> T:
+    """
+    Lee, descifra y valida las credenciales de un banco.
+    
+    Reúne el flujo común a todos los scrapers: lee el credential cifrado,
+    lo descifra con Fernet, parsea el JSON y extrae (con strip) cada campo
+    declarado en CREDENTIAL_FIELDS. Todos los campos son obligatorios.
+    
+    Args:
+        cred_name: Nombre del archivo de credencial (ej: "oca_creds").
+        fields: CREDENTIAL_FIELDS del banco.
+        cls: Dataclass de credenciales; se construye con un kwarg por campo.
+        
+    Returns:
+        Instancia de cls con los valores de cada campo.
+        
+    Raises:
+        RuntimeError: Si el archivo no existe, no es JSON válido,
+                      o faltan campos requeridos.
+        
+    Example:
+        >>> creds = load_creds("oca_creds", CREDENTIAL_FIELDS, OcaCreds)
+    """
+    json_text = decrypt_fernet(require_credential_bytes(cred_name))
+
+    try:
+        obj = json.loads(json_text)
+    except Exception as e:
+        raise RuntimeError(f"El credential {cred_name} no es un JSON válido: {e}")
+
+    vals = {f["name"]: (obj.get(f["name"]) or "").strip() for f in fields}
+    missing = [k for k, v in vals.items() if not v]
+    if missing:
+        raise RuntimeError(f"El credential {cred_name} debe incluir: {', '.join(missing)}")
+
+    return cls(**vals)
+
+
 # =============================================================================
 # NORMALIZACIÓN DE DATOS
 # =============================================================================
 
+_CURRENCY_RE = re.compile(
+    r"(?=(?P<usd>USD|U\$S|US\$|DÓLARES|DOLARES)"
+    r"|(?P<uyu>UYU|\$|PESOS)"
+    r"|(?P<eur>EUR|€|EUROS))"
+)
+"""
+Patrones de todas las monedas en una sola alternación.
+
+Los grupos van dentro de un lookahead para que las coincidencias puedan
+solaparse (igual que buscar cada patrón como substring por separado).
+"""
+
+_CURRENCY_PRIORITY = ("usd", "uyu", "eur")
+"""Orden de prioridad si el texto contiene patrones de varias monedas."""
+
+_CURRENCY_FORMS = {
+    "usd": ("U$S", "usd"),
+    "uyu": ("$", "uyu"),
+    "eur": ("€", "eur"),
+}
+"""Moneda → (símbolo, código)."""
+
+_CURRENCY_FAST = {
+    "USD": _CURRENCY_FORMS["usd"],
+    "U$S": _CURRENCY_FORMS["usd"],
+    "US$": _CURRENCY_FORMS["usd"],
+    "DÓLARES": _CURRENCY_FORMS["usd"],
+    "DOLARES": _CURRENCY_FORMS["usd"],
+    "UYU": _CURRENCY_FORMS["uyu"],
+    "$": _CURRENCY_FORMS["uyu"],
+    "PESOS": _CURRENCY_FORMS["uyu"],
+    "": _CURRENCY_FORMS["uyu"],
+    "EUR": _CURRENCY_FORMS["eur"],
+    "€": _CURRENCY_FORMS["eur"],
+    "EUROS": _CURRENCY_FORMS["eur"],
+}
+"""Entradas exactas más comunes (ya en mayúsculas), resueltas sin regex."""
+
+
+@lru_cache(maxsize=512)
+def _lookup_currency(raw: str) -> tuple[str, str]:
+    """
+    Resuelve una moneda a (símbolo, código) (memoizado).
+    
+    Args:
+        raw: Texto de moneda en cualquier formato.
+        
+    Returns:
+        tuple: (símbolo, código). Si no matchea ningún patrón conocido,
+               retorna (raw, raw.lower()).
+    """
+    s = (raw or "").upper().strip()
+    
+    # Camino rápido: entradas conocidas (UYU, USD, "$", "U$S", "", ...)
+    hit = _CURRENCY_FAST.get(s)
+    if hit is not None:
+        return hit
+    
+    # Un solo recorrido de s; gana la moneda de mayor prioridad encontrada
+    found = {m.lastgroup for m in _CURRENCY_RE.finditer(s) if m.lastgroup}
+    for key in _CURRENCY_PRIORITY:
+        if key in found:
+            return _CURRENCY_FORMS[key]
+    
+    # Si no matchea ningún patrón conocido, retornar el original
+    return raw, raw.lower()
+
+
+def normalize_currency_symbol(raw: str) -> str:
+    """
+    Normaliza una moneda a su símbolo ($, U$S, €).
+    
+    Versión especializada de normalize_currency(raw, "symbol").
+    
+    Args:
+        raw: Texto de moneda en cualquier formato.
+        
+    Returns:
+        str: Símbolo de la moneda, o el texto original si no se reconoce.
+    """
+    return _lookup_currency(raw)[0]
+
+
+def normalize_currency_code(raw: str) -> str:
+    """
+    Normaliza una moneda a su código en minúscula (uyu, usd, eur).
+    
+    Versión especializada de normalize_currency(raw, "code").
+    
+    Args:
+        raw: Texto de moneda en cualquier formato.
+        
+    Returns:
+        str: Código de la moneda, o el texto original en minúscula si no se reconoce.
+    """
+    return _lookup_currency(raw)[1]
+
+
 def normalize_currency(
     raw: str, 
     output_format: Literal["symbol", "code"] = "symbol"
@@ -178,6 +414,10 @@ def normalize_currency(
     
     Soporta múltiples formatos de entrada para las monedas más comunes
     en Uruguay (UYU, USD) y las convierte a un formato consistente.
+    Texto vacío se interpreta como pesos uruguayos.
+    
+    Si el formato se conoce de antemano, preferir normalize_currency_symbol()
+    o normalize_currency_code(), que evitan el despacho por output_format.
     
     Args:
         raw: Texto de moneda en cualquier formato.
@@ -197,25 +437,63 @@ def normalize_currency(
         >>> normalize_currency("Pesos")
         '$'
     """
-    s = (raw or "").upper().strip()
+    symbol, code = _lookup_currency(raw)
+    return code if output_format == "code" else symbol
+
+
+_AMOUNT_CHARS = frozenset("0123456789.,")
+"""Caracteres que forman parte de un monto numérico."""
+
+
+@lru_cache(maxsize=1024)
+def _parse_number(raw: str) -> float | None:
+    """
+    Extrae el valor numérico de un monto (memoizado).
     
-    # Mapeo de patrones a (lista_patrones, símbolo, código)
-    currency_mapping = {
-        "usd": (["USD", "U$S", "US$", "DÓLARES", "DOLARES"], "U$S", "usd"),
-        "uyu": (["UYU", "$", "PESOS"], "$", "uyu"),
-        "eur": (["EUR", "€", "EUROS"], "€", "eur"),
-    }
+    Recorre el string una sola vez tomando el primer bloque de
+    dígitos/puntos/comas y recordando la posición del último punto y de
+    la última coma; con eso decide cuál es el separador decimal.
     
-    for patterns, symbol, code in currency_mapping.values():
-        if any(p in s for p in patterns):
-            return code if output_format == "code" else symbol
+    Retorna un float inmutable para que el cache no pueda ser alterado
+    por quien use el dict que arma parse_amount().
     
-    # Default: pesos uruguayos (moneda más común en los bancos soportados)
-    if not s:
-        return "uyu" if output_format == "code" else "$"
+    Args:
+        raw: String con el monto en cualquier formato.
+        
+    Returns:
+        float | None: Valor numérico, o None si no se pudo parsear.
+    """
+    buf: list[str] = []
+    last_dot = last_comma = -1
+    for ch in (raw or "").strip():
+        if ch in _AMOUNT_CHARS:
+            if ch == ".":
+                last_dot = len(buf)
+            elif ch == ",":
+                last_comma = len(buf)
+            buf.append(ch)
+        elif buf:
+            # Fin del primer bloque numérico
+            break
     
-    # Si no matchea ningún patrón conocido, retornar el original
-    return raw.lower() if output_format == "code" else raw
+    if not buf:
+        return None
+    
+    if last_comma > last_dot:
+        # Coma como decimal: formato uruguayo (1.234,56) o solo coma (5,40)
+        num_str = "".join("." if ch == "," else ch for ch in buf if ch != ".")
+    elif last_comma >= 0:
+        # Punto después de la coma → formato americano (1,234.56)
+        num_str = "".join(ch for ch in buf if ch != ",")
+    else:
+        # Solo punto (o ninguno): se interpreta como decimal directamente
+        num_str = "".join(buf)
+    
+    # Validación barata en lugar de try/except: num_str solo tiene dígitos
+    # y puntos, así que float() falla únicamente con más de un punto o sin dígitos
+    if num_str.count(".") > 1 or not num_str.strip("."):
+        return None
+    return float(num_str)
 
 
 def parse_amount(raw: str) -> dict[str, Any]:
@@ -226,6 +504,8 @@ def parse_amount(raw: str) -> dict[str, Any]:
     de miles y la coma es separador decimal. También detecta y maneja
     el formato americano (1,234.56) automáticamente.
     
+    El parseo se memoiza por string; cada llamada retorna un dict nuevo.
+    
     Args:
         raw: String con el monto en cualquier formato.
              Ejemplos: "1.234,56", "$ 5,40", "US$ 100,00", "1234.56"
@@ -245,32 +525,78 @@ def parse_amount(raw: str) -> dict[str, Any]:
         >>> parse_amount("")
         {'raw': '', 'number': None}
     """
-    s = (raw or "").strip()
-    if not s:
-        return {"raw": raw, "number": None}
+    return {"raw": raw, "number": _parse_number(raw)}
+
+
+# =============================================================================
+# HELPERS DE DOM
+# =============================================================================
+
+JS_FILL_INPUTS = """
+const [inputs, values] = arguments;
+const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+inputs.forEach((el, i) => {
+    setter.call(el, values[i]);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+"""
+"""Completa varios inputs usando el setter nativo (compatible con frameworks SPA)."""
+
+
+def fill_inputs(driver, elements: list, values: list[str]) -> None:
+    """
+    Completa varios inputs en un único round-trip a geckodriver.
     
-    try:
-        # Extraer solo dígitos, puntos y comas usando regex
-        match = re.search(r"[\d.,]+", s)
-        if not match:
-            return {"raw": raw, "number": None}
-        
-        num_str = match.group()
+    Reemplaza clear() + send_keys(), que envía un comando por cada
+    caracter. Dispara eventos input/change para que el framework del
+    sitio registre los valores.
+    
+    Args:
+        driver: Instancia del WebDriver de Selenium.
+        elements: WebElements de los inputs a completar.
+        values: Valores a asignar, en el mismo orden que elements.
+    """
+    driver.execute_script(JS_FILL_INPUTS, list(elements), list(values))
+
+
+def wait_for(
+    driver,
+    locator: tuple[str, str],
+    timeout: float = 60,
+    initial: float = 0.05,
+    max_interval: float = 1.0,
+):
+    """
+    Espera a que aparezca un elemento, con polling de backoff exponencial.
+    
+    Alternativa a WebDriverWait(...).until(presence_of_element_located(...))
+    para transiciones cuya duración varía mucho (ej: login → dashboard):
+    empieza consultando cada 50ms y espacia los polls (x1.5) hasta
+    max_interval, detectando rápido las páginas veloces sin saturar
+    a geckodriver en las lentas.
+    
+    Args:
+        driver: Instancia del WebDriver de Selenium.
+        locator: Tupla (By, selector).
+        timeout: Segundos máximos de espera.
+        initial: Intervalo inicial de polling en segundos.
+        max_interval: Intervalo máximo de polling en segundos.
         
-        # Detectar formato basándose en la posición de coma vs punto
-        if "," in num_str and "." in num_str:
-            # Ambos separadores presentes: determinar cuál es el decimal
-            if num_str.rfind(",") > num_str.rfind("."):
-                # Coma después del punto → formato uruguayo (1.234,56)
-                num_str = num_str.replace(".", "").replace(",", ".")
-            else:
-                # Punto después de la coma → formato americano (1,234.56)
-                num_str = num_str.replace(",", "")
-        elif "," in num_str:
-            # Solo coma: asumimos formato uruguayo (coma = decimal)
-            num_str = num_str.replace(",", ".")
-        # Si solo tiene punto, se interpreta como decimal directamente
+    Returns:
+        WebElement: Primer elemento que coincide con el locator.
         
-        return {"raw": raw, "number": float(num_str)}
-    except Exception:
-        return {"raw": raw, "number": None}
+    Raises:
+        TimeoutException: Si el elemento no aparece dentro del timeout.
+    """
+    deadline = time.monotonic() + timeout
+    interval = initial
+    while True:
+        found = driver.find_elements(*locator)
+        if found:
+            return found[0]
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"Timeout esperando {locator[1]} ({timeout}s)")
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, max_interval)
@@ -7,7 +7,7 @@ desde el portal Mi Cuenta OCA. Soporta múltiples tarjetas y monedas (UYU/USD).
 Características:
     - Extracción de cuentas OCA Blue (débito) en pesos y dólares
     - Extracción de tarjetas de crédito con consumos y disponible
-    - Navegación automática al detalle de cada tarjeta para obtener disponible
+    - Descarga en paralelo del detalle de cada tarjeta para obtener disponible
     - Manejo de modales emergentes (encuestas NPS)
 
 Uso:
@@ -16,9 +16,11 @@ Uso:
 """
 from __future__ import annotations
 
-import json
+import logging
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
@@ -26,13 +28,17 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from .common import (
-    require_credential, 
-    decrypt_fernet, 
-    normalize_currency,
+    Account,
+    load_creds,
+    normalize_currency_symbol,
     parse_amount,
     now_iso,
+    fill_inputs,
+    wait_for,
 )
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # CONFIGURACIÓN DEL BANCO
@@ -56,6 +62,9 @@ CREDENTIAL_FIELDS = [
 OCA_LOGIN_URL = "https://micuentanuevo.oca.com.uy/trx/login"
 """URL de inicio de sesión del portal Mi Cuenta OCA."""
 
+OCA_CREDIT_DETAIL_URL = "https://micuentanuevo.oca.com.uy/trx/tarjetas/credito/{}"
+"""URL del detalle de una tarjeta de crédito (se formatea con el id de la tarjeta)."""
+
 
 # =============================================================================
 # SELECTORES DOM - LOGIN
@@ -73,6 +82,9 @@ SEL_LOGIN_BTN = (By.ID, "buttonlogin")
 SEL_MODAL_CLOSE = (By.ID, "nps-close-button-nps-custom")
 """Botón para cerrar modal de encuesta NPS (si aparece)."""
 
+SEL_DASHBOARD = (By.CLASS_NAME, "card-dashboard")
+"""Elemento que indica que el dashboard cargó (login exitoso)."""
+
 
 # =============================================================================
 # SELECTORES DOM - OCA BLUE (DÉBITO)
@@ -95,15 +107,120 @@ SEL_CREDIT_SECTION = (By.CSS_SELECTOR, "section[data-function='parseTarjetasCred
 SEL_CREDIT_CARDS = (By.CSS_SELECTOR, "a.card-home-tarjetas")
 """Tarjetas individuales de crédito (links al detalle)."""
 
-SEL_DETAIL_AVAILABLE = (By.XPATH, "/html/body/div/div[7]/div[2]/div[2]/div/div[3]/div/div[3]/div/div[1]/div[2]/div")
+SEL_DETAIL_AVAILABLE = (
+    By.CSS_SELECTOR,
+    "body > div > div:nth-of-type(7) > div:nth-of-type(2) > div:nth-of-type(2) > div"
+    " > div:nth-of-type(3) > div > div:nth-of-type(3) > div > div:nth-of-type(1)"
+    " > div:nth-of-type(2) > div",
+)
 """Elemento con el saldo disponible en la página de detalle de tarjeta.
-   Nota: XPath absoluto, puede romperse si cambia el DOM."""
+   Equivalente CSS del XPath absoluto original
+   (/html/body/div/div[7]/div[2]/div[2]/div/div[3]/div/div[3]/div/div[1]/div[2]/div),
+   resuelto con querySelector nativo. Puede romperse si cambia el DOM."""
+
+
+# =============================================================================
+# SCRIPTS JS
+# =============================================================================
+
+JS_READ_BLUE = """
+const [container, cardSel] = arguments;
+const txt = (card, cls) => {
+    const el = card.querySelector('.' + cls);
+    return el ? (el.textContent || '').trim() : null;
+};
+return Array.from(container.querySelectorAll(cardSel)).map(
+    c => [txt(c, 'moneda-card'), txt(c, 'cuenta-numero'), txt(c, 'saldo-valor')]
+);
+"""
+"""
+Lee todas las cuentas Blue en un solo round-trip como
+[moneda, número, saldo] (null en los campos que falten).
+"""
+
+JS_READ_CREDIT = """
+const [section, cardSel] = arguments;
+return Array.from(section.querySelectorAll(cardSel)).map(c => {
+    const brand = c.querySelector('.marca-tarjeta-card');
+    return {
+        id: c.id,
+        name: brand ? (brand.textContent || '').trim() : null,
+        consumos_raw: Array.from(c.querySelectorAll('.saldo-valor')).map(s => (s.textContent || '').trim()),
+    };
+});
+"""
+"""
+Lee todas las tarjetas de crédito del dashboard en un solo round-trip
+como {id, name, consumos_raw} (name null si falta la marca).
+"""
+
+JS_CLOSE_MODAL = """
+const b = document.getElementById(arguments[0]);
+if (b && b.offsetParent !== null) b.click();
+"""
+"""Cierra el modal NPS (SEL_MODAL_CLOSE) si está visible; no hace nada si no existe."""
+
+JS_READ_DETAIL = """
+const el = document.querySelector(arguments[0]);
+return el ? (el.textContent || '').trim() : null;
+"""
+"""Texto del disponible (SEL_DETAIL_AVAILABLE) en la página actual, o null si aún no está."""
+
+JS_FETCH_DETAILS = """
+const [urls, selector, timeoutMs, done] = [arguments[0], arguments[1], arguments[2], arguments[arguments.length - 1]];
+Promise.all(urls.map(u => {
+    const ctrl = new AbortController();
+    const timer = setTimeout(() => ctrl.abort(), timeoutMs);
+    return fetch(u, {credentials: 'same-origin', signal: ctrl.signal})
+        .then(r => r.ok ? r.text() : null)
+        .then(html => {
+            if (!html) return null;
+            const doc = new DOMParser().parseFromString(html, 'text/html');
+            const node = doc.querySelector(selector);
+            return node ? (node.textContent || '').trim() : null;
+        })
+        .catch(() => null)
+        .finally(() => clearTimeout(timer));
+})).then(done);
+"""
+"""
+Descarga en paralelo (fetch, con la sesión del navegador) el HTML del
+detalle de cada tarjeta y retorna el texto del disponible
+(SEL_DETAIL_AVAILABLE), o null por cada URL cuyo HTML no lo contenga
+(ej: si se renderiza por JS) o que no responda en timeoutMs.
+"""
 
 
 # =============================================================================
 # CONFIGURACIÓN INTERNA
 # =============================================================================
 
+_MONEY_RE = re.compile(r"(?:US\$|\$)[\s\xa0]*[0-9.,]+", re.ASCII)
+"""Símbolo de moneda + espacios + dígitos/puntos/comas (ej: "$ 5,40").
+   ASCII-only; el espacio duro (NBSP) se incluye explícitamente."""
+
+_CARD_RE = re.compile(r"OCA.*?([0-9]{4})", re.ASCII)
+"""Últimos 4 dígitos en textos como "OCA **** 1234"."""
+
+WAIT_TIMEOUT = 45
+"""Timeout (segundos) de las esperas explícitas."""
+
+DASHBOARD_POLL_MAX = 0.2
+"""Intervalo máximo (segundos) entre polls mientras se espera el dashboard."""
+
+DETAIL_WAIT_TIMEOUT = WAIT_TIMEOUT
+"""Timeout (segundos) para el disponible en el detalle de las tarjetas.
+   Es un plazo común a todas las pestañas, que cargan en paralelo: el lote
+   entero tiene el mismo margen que antes tenía cada tarjeta por separado."""
+
+DETAIL_FETCH_TIMEOUT = 10
+"""Timeout (segundos) de cada fetch() de JS_FETCH_DETAILS (AbortController).
+   Menor que el script timeout por defecto de Selenium (30 s), así un
+   request colgado cae a la lectura por pestañas en vez de cortar el script."""
+
+DETAIL_POLL = 0.2
+"""Pausa (segundos) entre rondas de lectura de las pestañas de detalle."""
+
 REQUIRED_CREDENTIALS = {
     "creds": f"{BANK_KEY}_creds",
 }
@@ -121,6 +238,14 @@ class OcaCreds:
     password: str
 
 
+@dataclass(slots=True)
+class _CardStage:
+    """Datos de una tarjeta de crédito leídos del dashboard (fase 1)."""
+    id: str
+    name: str
+    consumos_raw: list[str]
+
+
 # =============================================================================
 # FUNCIONES INTERNAS
 # =============================================================================
@@ -139,41 +264,7 @@ def _get_creds() -> OcaCreds:
         RuntimeError: Si el archivo no existe, no es JSON válido,
                       o faltan campos requeridos.
     """
-    raw = require_credential(REQUIRED_CREDENTIALS["creds"])
-    json_text = decrypt_fernet(raw)
-    
-    try:
-        obj = json.loads(json_text)
-    except Exception as e:
-        raise RuntimeError(f"JSON inválido en {REQUIRED_CREDENTIALS['creds']}: {e}")
-
-    doc = (obj.get("document") or "").strip()
-    pwd = (obj.get("password") or "").strip()
-    
-    if not doc or not pwd:
-        raise RuntimeError("Faltan campos document/password en las credenciales")
-    
-    return OcaCreds(document=doc, password=pwd)
-
-
-def _safe_text(elem) -> str:
-    """
-    Extrae texto de un elemento web de forma robusta.
-    
-    Usa textContent en lugar de .text para obtener el contenido
-    incluso si el elemento está oculto o tiene estilos CSS especiales.
-    Esto es especialmente útil en modo headless.
-    
-    Args:
-        elem: Elemento WebElement de Selenium.
-        
-    Returns:
-        str: Texto del elemento, o cadena vacía si falla.
-    """
-    try:
-        return (elem.get_attribute("textContent") or "").strip()
-    except Exception:
-        return ""
+    return load_creds(REQUIRED_CREDENTIALS["creds"], CREDENTIAL_FIELDS, OcaCreds)
 
 
 def _clean_raw_money(raw_val: str) -> str:
@@ -192,12 +283,52 @@ def _clean_raw_money(raw_val: str) -> str:
     if not raw_val:
         return raw_val
     # Busca patrón: símbolo de moneda + espacios + dígitos/puntos/comas
-    match = re.search(r"(?:US\$|\$)\s*[\d.,]+", raw_val)
+    match = _MONEY_RE.search(raw_val)
     if match:
         return match.group(0).strip()
     return raw_val
 
 
+@lru_cache(maxsize=512)
+def _money_fields(raw_val: str) -> tuple[str, str, float | None]:
+    """
+    Limpia y parsea un monto, detectando su moneda (memoizado).
+    
+    Reúne _clean_raw_money + parse_amount + detección de moneda: los
+    mismos textos (ej: "$ 0,00") se repiten entre tarjetas y solo se
+    procesan una vez. Retorna una tupla inmutable para que nadie pueda
+    alterar el cache; _parse_money() arma el dict de cada llamada.
+    
+    Args:
+        raw_val: String no vacío con el monto posiblemente con texto extra.
+        
+    Returns:
+        tuple: (moneda "USD"/"UYU", monto limpio, valor numérico o None).
+    """
+    clean = _clean_raw_money(raw_val)
+    currency = "USD" if "US" in clean else "UYU"
+    amount = parse_amount(clean)
+    return currency, amount["raw"], amount["number"]
+
+
+def _parse_money(raw_val: str | None) -> tuple[str, dict]:
+    """
+    Limpia y parsea un monto, detectando su moneda.
+    
+    Args:
+        raw_val: String con el monto posiblemente con texto extra, o None
+                 si no se pudo leer.
+        
+    Returns:
+        tuple: (moneda "USD"/"UYU", monto como objeto {raw, number} nuevo
+               en cada llamada). Sin monto se asume UYU y número None.
+    """
+    if not raw_val:
+        return "UYU", {"raw": raw_val, "number": None}
+    currency, raw, number = _money_fields(raw_val)
+    return currency, {"raw": raw, "number": number}
+
+
 def _extract_card_number(brand_text: str) -> str:
     """
     Extrae los últimos 4 dígitos del número de tarjeta.
@@ -210,14 +341,99 @@ def _extract_card_number(brand_text: str) -> str:
     Returns:
         str: Solo los últimos 4 dígitos, o el texto original si no matchea.
     """
-    if "****" in brand_text:
-        try:
-            match = re.search(r"OCA.*?(\d{4})", brand_text)
-            if match:
-                return match.group(1)
-        except Exception:
-            pass
-    return brand_text
+    match = _CARD_RE.search(brand_text)
+    return match.group(1) if match else brand_text
+
+
+def _detail_text(driver: WebDriver) -> str | None:
+    """
+    Texto del disponible en la página de detalle actual.
+    
+    Cada consulta es un único execute_script que busca el elemento con
+    querySelector y retorna su texto directamente (sin find_element +
+    get_attribute posteriores).
+    
+    Args:
+        driver: Instancia del WebDriver de Selenium.
+        
+    Returns:
+        str | None: Texto del disponible, o None si todavía no cargó.
+    """
+    return driver.execute_script(JS_READ_DETAIL, SEL_DETAIL_AVAILABLE[1]) or None
+
+
+def _read_details_in_tabs(driver: WebDriver, urls: list[str]) -> list[str | None]:
+    """
+    Lee el disponible de varias páginas de detalle abriéndolas en pestañas.
+    
+    Abre una pestaña por URL e inicia la navegación con JS (sin bloquear),
+    así el navegador carga todas las páginas en paralelo. Luego recorre las
+    pestañas en rondas (round-robin) leyendo SEL_DETAIL_AVAILABLE de las
+    que ya cargaron, hasta completarlas todas o agotar DETAIL_WAIT_TIMEOUT.
+    El tiempo total es aproximadamente el de la carga más lenta, y una
+    pestaña que no carga no demora la lectura de las demás.
+    
+    La sesión WebDriver es de un solo hilo, por eso las pestañas se recorren
+    secuencialmente desde el hilo actual; lo que se solapa es la carga.
+    
+    Args:
+        driver: Instancia del WebDriver de Selenium.
+        urls: URLs de detalle a cargar.
+        
+    Returns:
+        Lista alineada con urls: texto del disponible, o None si no apareció.
+    """
+    main_handle = driver.current_window_handle
+    tabs = []
+    results: list[str | None] = [None] * len(urls)
+    try:
+        # Abrir todas las pestañas e iniciar las navegaciones
+        for url in urls:
+            driver.switch_to.new_window("tab")
+            driver.execute_script("window.location.href = arguments[0];", url)
+            tabs.append(driver.current_window_handle)
+
+        # Recorrer las pestañas pendientes hasta leerlas todas (o timeout)
+        pending = dict(enumerate(tabs))
+        deadline = time.monotonic() + DETAIL_WAIT_TIMEOUT
+        while pending:
+            for idx, handle in list(pending.items()):
+                driver.switch_to.window(handle)
+                try:
+                    text = _detail_text(driver)
+                except Exception:
+                    # Navegación en curso (documento descargándose): reintentar
+                    continue
+                if text:
+                    results[idx] = text
+                    del pending[idx]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    f"Disponible sin cargar en {len(pending)}/{len(urls)} pestañas "
+                    f"tras {DETAIL_WAIT_TIMEOUT}s"
+                )
+                break
+            time.sleep(DETAIL_POLL)
+    except Exception:
+        # Sesión caída o pestaña que no se pudo abrir: se devuelven los
+        # disponibles leídos hasta ahora, pero dejando rastro del error
+        logger.warning(
+            f"Lectura de detalles incompleta ({sum(r is not None for r in results)}/{len(urls)})",
+            exc_info=True,
+        )
+    finally:
+        # Cerrar las pestañas abiertas y volver a la original
+        for handle in tabs:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        driver.switch_to.window(main_handle)
+
+    return results
 
 
 # =============================================================================
@@ -228,55 +444,47 @@ def login(driver: WebDriver, wait: WebDriverWait, creds: OcaCreds) -> None:
     """
     Realiza el proceso de autenticación en el portal OCA.
     
-    Navega a la página de login, completa el formulario con las
-    credenciales y maneja modales de encuesta NPS si aparecen.
+    Completa el formulario con las credenciales y maneja modales de
+    encuesta NPS si aparecen. Asume que el driver ya navegó a
+    OCA_LOGIN_URL (run() lo hace mientras descifra las credenciales).
     
     Args:
         driver: Instancia del WebDriver de Selenium.
         wait: WebDriverWait configurado con timeout.
         creds: Credenciales de acceso.
     """
-    driver.get(OCA_LOGIN_URL)
-
-    # Completar campo documento
-    doc_in = wait.until(EC.element_to_be_clickable(SEL_DOC_INPUT))
-    doc_in.clear()
-    doc_in.send_keys(creds.document)
-
-    # Completar campo contraseña
-    pwd_in = wait.until(EC.element_to_be_clickable(SEL_PWD_INPUT))
-    pwd_in.clear()
-    pwd_in.send_keys(creds.password)
+    # Esperar ambos campos y completarlos en un solo round-trip
+    doc_in, pwd_in = wait.until(EC.all_of(
+        EC.element_to_be_clickable(SEL_DOC_INPUT),
+        EC.element_to_be_clickable(SEL_PWD_INPUT),
+    ))
+    fill_inputs(driver, [doc_in, pwd_in], [creds.document, creds.password])
 
     # Cerrar modal NPS si está visible (no bloquea si no existe)
-    try:
-        modal_btn = driver.find_element(*SEL_MODAL_CLOSE)
-        if modal_btn.is_displayed():
-            modal_btn.click()
-    except Exception:
-        pass
+    # (un solo round-trip en lugar de find_element + is_displayed + click)
+    driver.execute_script(JS_CLOSE_MODAL, SEL_MODAL_CLOSE[1])
 
     # Enviar formulario
     login_btn = wait.until(EC.element_to_be_clickable(SEL_LOGIN_BTN))
     login_btn.click()
 
-    # Esperar carga del dashboard
-    wait.until(EC.presence_of_element_located((By.CLASS_NAME, "card-dashboard")))
+    # Esperar carga del dashboard (polling con backoff, como máximo cada 200ms)
+    wait_for(driver, SEL_DASHBOARD, timeout=WAIT_TIMEOUT, max_interval=DASHBOARD_POLL_MAX)
 
 
-def extract_blue(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
+def extract_blue(driver: WebDriver, wait: WebDriverWait) -> list[Account]:
     """
     Extrae información de cuentas OCA Blue (débito).
     
     Busca la sección de "Cajas de Ahorro" y extrae cada cuenta
-    con su moneda, número y saldo.
+    con su moneda, número y saldo (todas con un único execute_script).
     
     Args:
         driver: Instancia del WebDriver de Selenium.
         wait: WebDriverWait configurado con timeout.
         
     Returns:
-        Lista de diccionarios con la información de cada cuenta Blue:
+        Lista de Account con la información de cada cuenta Blue:
         - type: "ACCOUNT"
         - currency: Símbolo de moneda normalizado
         - account_number: "OCA Blue <número>"
@@ -300,49 +508,49 @@ def extract_blue(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
             # Si no aparecen en 5s, asumimos que no hay o que ya cargó vacío
             pass
 
-        cards = container.find_elements(*SEL_BLUE_CARDS)
+        cards = driver.execute_script(JS_READ_BLUE, container, SEL_BLUE_CARDS[1]) or []
     except Exception:
         return []
 
-    for card in cards:
+    for currency_lbl, acc_num, balance_dirty in cards:
+        # Saltar tarjetas incompletas (falta algún campo)
+        if currency_lbl is None or acc_num is None or balance_dirty is None:
+            continue
         try:
-            # Extraer datos de la tarjeta
-            currency_lbl = _safe_text(card.find_element(By.CLASS_NAME, "moneda-card"))
-            acc_num = _safe_text(card.find_element(By.CLASS_NAME, "cuenta-numero"))
-            balance_dirty = _safe_text(card.find_element(By.CLASS_NAME, "saldo-valor"))
-            
-            balance_raw = _clean_raw_money(balance_dirty)
             currency = "USD" if "Dólares" in currency_lbl else "UYU"
-            saldo = parse_amount(balance_raw)
-
-            accounts.append({
-                "type": "ACCOUNT",
-                "currency": normalize_currency(currency),
-                "account_number": f"OCA Blue {acc_num}",
-                "balance": saldo,
-                "available": saldo,  # En cuentas Blue, balance = disponible
-                "logo": OCA_BLUE_LOGO,
-            })
+            _, saldo = _parse_money(balance_dirty)
+
+            accounts.append(Account(
+                type="ACCOUNT",
+                currency=normalize_currency_symbol(currency),
+                account_number=f"OCA Blue {acc_num}",
+                balance=saldo,
+                available=saldo,  # En cuentas Blue, balance = disponible
+                logo=OCA_BLUE_LOGO,
+            ))
         except Exception:
             continue
             
     return accounts
 
 
-def extract_credit_cards(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
+def extract_credit_cards(driver: WebDriver, wait: WebDriverWait) -> list[Account]:
     """
     Extrae información de tarjetas de crédito.
     
     Este proceso es más complejo porque requiere:
     1. Extraer info básica del dashboard (consumos por moneda)
-    2. Navegar al detalle de cada tarjeta para obtener el disponible
+    2. Obtener el disponible del detalle de cada tarjeta: primero se
+       descargan todos los detalles en paralelo con fetch() desde el
+       navegador; las tarjetas que no se resuelvan así se abren en
+       pestañas que cargan en paralelo
     
     Args:
         driver: Instancia del WebDriver de Selenium.
         wait: WebDriverWait configurado con timeout.
         
     Returns:
-        Lista de diccionarios con la información de cada tarjeta:
+        Lista de Account con la información de cada tarjeta:
         - type: "CREDIT_CARD"
         - currency: Símbolo de moneda normalizado
         - account_number: "OCA Credito <últimos 4 dígitos>"
@@ -354,72 +562,73 @@ def extract_credit_cards(driver: WebDriver, wait: WebDriverWait) -> list[dict]:
         Una tarjeta puede generar múltiples entradas si tiene consumos
         en diferentes monedas (UYU y USD).
     """
+    # Fase 1: Extraer info básica del dashboard (un solo round-trip).
+    # Puede haber múltiples saldos por tarjeta (UYU y USD).
     try:
         section = driver.find_element(*SEL_CREDIT_SECTION)
-        card_links = section.find_elements(*SEL_CREDIT_CARDS)
+        cards = driver.execute_script(JS_READ_CREDIT, section, SEL_CREDIT_CARDS[1]) or []
     except Exception:
         return []
 
-    # Fase 1: Extraer info básica del dashboard
-    to_process = []
-    for link in card_links:
-        try:
-            card_id = link.get_attribute("id")
-            brand_text = _safe_text(link.find_element(By.CLASS_NAME, "marca-tarjeta-card"))
-            
-            # Puede haber múltiples saldos (UYU y USD)
-            saldos_elems = link.find_elements(By.CLASS_NAME, "saldo-valor")
-            vals = [_safe_text(s) for s in saldos_elems]
-            
-            to_process.append({
-                "id": card_id,
-                "name": brand_text,
-                "consumos_raw": vals
-            })
-        except Exception:
-            continue
+    to_process = [
+        _CardStage(c["id"], c["name"], c["consumos_raw"])
+        for c in cards
+        if c.get("name") is not None
+    ]
 
     final_cards = []
     
-    # Fase 2: Navegar al detalle de cada tarjeta para obtener disponible
-    for item in to_process:
-        url = f"https://micuentanuevo.oca.com.uy/trx/tarjetas/credito/{item['id']}"
-        driver.get(url)
+    # Fase 2a: Descargar todos los detalles en paralelo (un solo round-trip)
+    urls = [OCA_CREDIT_DETAIL_URL.format(item.id) for item in to_process]
+    try:
+        prefetched = driver.execute_async_script(
+            JS_FETCH_DETAILS, urls, SEL_DETAIL_AVAILABLE[1], DETAIL_FETCH_TIMEOUT * 1000
+        ) or []
+    except Exception:
+        logger.warning("No se pudieron descargar los detalles con fetch(); se usan pestañas", exc_info=True)
+        prefetched = []
+
+    # Fase 2b: Las tarjetas que no se resolvieron con fetch() se cargan
+    # todas a la vez, una pestaña por tarjeta. El selector posicional se
+    # aplica al HTML crudo del servidor, que puede no coincidir con la página
+    # renderizada: solo se acepta texto con forma de monto.
+    details = [
+        text if text and _MONEY_RE.search(text) else None
+        for text in prefetched[:len(to_process)]
+    ]
+    details += [None] * (len(to_process) - len(details))
+    pending = [i for i, text in enumerate(details) if not text]
+    if pending:
+        texts = _read_details_in_tabs(driver, [urls[i] for i in pending])
+        for i, text in zip(pending, texts):
+            details[i] = text
+
+    # Fase 3: Armar las cuentas de cada tarjeta
+    for idx, item in enumerate(to_process):
+        avail_raw_dirty = details[idx]
         
-        # Intentar obtener el disponible
-        try:
-            avail_elem = wait.until(EC.presence_of_element_located(SEL_DETAIL_AVAILABLE))
-            avail_raw_dirty = _safe_text(avail_elem)
-            avail_raw = _clean_raw_money(avail_raw_dirty)
-            
-            avail_parsed = parse_amount(avail_raw)
-            avail_currency = "USD" if "US" in avail_raw else "UYU"
-        except Exception:
-            avail_parsed = {"raw": None, "number": None}
-            avail_currency = "UYU"
+        # Parsear el disponible (None si no se pudo obtener)
+        avail_currency, avail_parsed = _parse_money(avail_raw_dirty)
 
         # Procesar cada consumo (puede haber varios: UYU, USD, saldo a favor)
-        for raw_cons in item['consumos_raw']:
-            clean_cons = _clean_raw_money(raw_cons)
-            cons_parsed = parse_amount(clean_cons)
-            
-            currency = "USD" if "US" in clean_cons else "UYU"
+        for raw_cons in item.consumos_raw:
+            currency, cons_parsed = _parse_money(raw_cons)
             
             # Asignar disponible solo si coincide la moneda
             # (el disponible suele estar en UYU para tarjetas uruguayas)
             my_avail = avail_parsed.copy() if currency == avail_currency else {"raw": None, "number": None}
             
             # Limpiar número de tarjeta: "OCA **** 1234" → "1234"
-            acc_num_clean = _extract_card_number(item['name'])
+            acc_num_clean = _extract_card_number(item.name)
             
-            final_cards.append({
-                "type": "CREDIT_CARD",
-                "currency": normalize_currency(currency),
-                "account_number": f"OCA Credito {acc_num_clean}", 
-                "balance": cons_parsed,
-                "available": my_avail,
-                "logo": BANK_LOGO,
-            })
+            final_cards.append(Account(
+                type="CREDIT_CARD",
+                currency=normalize_currency_symbol(currency),
+                account_number=f"OCA Credito {acc_num_clean}",
+                balance=cons_parsed,
+                available=my_avail,
+                logo=BANK_LOGO,
+            ))
 
     return final_cards
 
@@ -445,8 +654,12 @@ def run(driver: WebDriver, env: dict[str, str]) -> dict:
         - updated_at: Timestamp ISO de la extracción
         - accounts: Lista combinada de cuentas Blue + tarjetas de crédito
     """
+    wait = WebDriverWait(driver, WAIT_TIMEOUT)
+
+    # Con pageLoadStrategy "none" driver.get() retorna enseguida: el
+    # descifrado de credenciales se solapa con la carga de la página de login
+    driver.get(OCA_LOGIN_URL)
     creds = _get_creds()
-    wait = WebDriverWait(driver, 45)
 
     # Autenticación
     login(driver, wait, creds)
@@ -457,5 +670,5 @@ def run(driver: WebDriver, env: dict[str, str]) -> dict:
 
     return {
         "updated_at": now_iso(),
-        "accounts": data_blue + data_cred,
+        "accounts": [asdict(a) for a in data_blue + data_cred],
     }
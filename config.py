@@ -20,6 +20,9 @@ from pathlib import Path
 OUTPUT_JSON = "/app/data/accounts.json"
 """Ruta del archivo JSON de salida con los saldos."""
 
+OUTPUT_JSON_GZ = OUTPUT_JSON + ".gz"
+"""Versión precomprimida (gzip) de OUTPUT_JSON, escrita junto con él."""
+
 LOGS_DIR = Path("./logs")
 """Directorio para archivos de log."""
 
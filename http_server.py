@@ -10,21 +10,116 @@ Características:
     - Filtro de IPs permitidas (configurable via ALLOWED_IPS)
     - Sin logs HTTP para evitar saturación
     - Timeout de conexión para evitar conexiones colgadas
+    - ETag / Last-Modified: responde 304 si el JSON no cambió
+    - Content-Encoding gzip con la versión precomprimida que escribe main.py
 
 Uso:
     Este módulo es iniciado automáticamente por scheduler.py en un hilo separado.
     No se ejecuta directamente.
 """
+import hashlib
 import http.server
-import socketserver
 import os
 import logging
+import threading
+from email.utils import formatdate
 
-from config import OUTPUT_JSON
+from config import OUTPUT_JSON, OUTPUT_JSON_GZ
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+_ALLOWED_IPS: frozenset[str] = frozenset(
+    ip.strip() for ip in os.getenv("ALLOWED_IPS", "").split(",") if ip.strip()
+)
+"""IPs autorizadas (ALLOWED_IPS, leído una vez al importar). Vacío = todas."""
+
+
+def _read_port() -> int:
+    """
+    Lee HTTP_PORT del entorno (default: 8000).
+    
+    Returns:
+        int: Puerto configurado, o 8000 si el valor no es un entero.
+    """
+    port_str = os.getenv("HTTP_PORT", "8000")
+    try:
+        return int(port_str)
+    except ValueError:
+        logger.warning(f"HTTP_PORT inválido ({port_str}), usando 8000 por defecto.")
+        return 8000
+
+
+_HTTP_PORT = _read_port()
+"""Puerto del servidor HTTP (HTTP_PORT, leído una vez al importar)."""
+
+
+# =============================================================================
+# CACHE DE VALIDADORES
+# =============================================================================
+
+_cache: dict[str, tuple[tuple[int, int], str, str]] = {}
+"""Por ruta: ((mtime_ns, tamaño), ETag, Last-Modified) de la última versión servida."""
+
+_cache_lock = threading.Lock()
+"""Protege _cache entre los hilos del ThreadingHTTPServer."""
+
+
+def _file_validators(f) -> tuple[int, str, str]:
+    """
+    Obtiene tamaño, ETag y Last-Modified de un archivo abierto.
+    
+    El ETag (hash del contenido) solo se recalcula cuando cambia el
+    mtime o el tamaño del archivo, es decir, tras cada ejecución del
+    scraper; los polls intermedios solo pagan un fstat.
+    
+    Args:
+        f: Archivo abierto en modo binario (queda posicionado al inicio).
+        
+    Returns:
+        tuple: (tamaño en bytes, ETag, Last-Modified en formato HTTP).
+    """
+    st = os.fstat(f.fileno())
+    key = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        entry = _cache.get(f.name)
+        if entry is None or entry[0] != key:
+            h = hashlib.blake2b(digest_size=8)
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                h.update(chunk)
+            f.seek(0)
+            entry = (key, f'"{h.hexdigest()}"', formatdate(st.st_mtime, usegmt=True))
+            _cache[f.name] = entry
+    return st.st_size, entry[1], entry[2]
+
+
+def _open_fresh_gzip(json_file):
+    """
+    Abre OUTPUT_JSON_GZ si corresponde a la versión actual del JSON.
+    
+    main.py escribe el .gz después del JSON, así que solo se considera
+    vigente si no es más viejo que el JSON abierto.
+    
+    Args:
+        json_file: OUTPUT_JSON ya abierto en modo binario.
+        
+    Returns:
+        Archivo .gz abierto en modo binario, o None si no existe o está desactualizado.
+    """
+    try:
+        gz = open(OUTPUT_JSON_GZ, "rb")
+    except FileNotFoundError:
+        return None
+    if os.fstat(gz.fileno()).st_mtime_ns < os.fstat(json_file.fileno()).st_mtime_ns:
+        gz.close()
+        return None
+    return gz
+
+
 # =============================================================================
 # HANDLER HTTP
 # =============================================================================
@@ -38,9 +133,12 @@ class JSONRequestHandler(http.server.SimpleHTTPRequestHandler):
     
     Attributes:
         timeout: Segundos antes de cerrar conexiones inactivas.
+        protocol_version: HTTP/1.1 para conexiones persistentes (todas
+                          las respuestas llevan Content-Length).
     """
     
     timeout = 5  # Evitar conexiones colgadas
+    protocol_version = "HTTP/1.1"  # Keep-alive: los pollers reutilizan la conexión
     
     def log_message(self, format, *args):
         """Silencia los logs HTTP estándar para no saturar la consola."""
@@ -53,38 +151,63 @@ class JSONRequestHandler(http.server.SimpleHTTPRequestHandler):
         Flujo:
             1. Verificar IP del cliente contra ALLOWED_IPS
             2. Validar que la ruta sea /accounts.json
-            3. Leer y servir el archivo JSON
+            3. Responder 304 si el ETag del cliente coincide
+            4. Si no, servir el archivo JSON (sendfile, sin leerlo en memoria),
+               precomprimido si el cliente acepta gzip
         """
         try:
             # Verificar filtro de IPs
-            allowed_ips_str = os.getenv("ALLOWED_IPS", "").strip()
-            if allowed_ips_str:
-                client_ip = self.client_address[0]
-                allowed_list = [ip.strip() for ip in allowed_ips_str.split(",") if ip.strip()]
-                if allowed_list and client_ip not in allowed_list:
-                    self.send_error(403, "Forbidden")
-                    return
+            if _ALLOWED_IPS and self.client_address[0] not in _ALLOWED_IPS:
+                self.send_error(403, "Forbidden")
+                return
 
             # Solo permitir la ruta del JSON
             if self.path != "/accounts.json":
                 self.send_error(404, "Not Found")
                 return
 
-            # Verificar que el archivo existe
-            if not os.path.exists(OUTPUT_JSON):
+            # Abrir el JSON (EAFP: sin os.path.exists previo)
+            try:
+                f = open(OUTPUT_JSON, "rb")
+            except FileNotFoundError:
                 self.send_error(404, "File not found yet")
                 return
 
-            # Leer y servir el JSON
-            with open(OUTPUT_JSON, "rb") as f:
-                content = f.read()
-            
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Content-Length", str(len(content)))
-            self.send_header("Cache-Control", "no-cache")
-            self.end_headers()
-            self.wfile.write(content)
+            # Preferir la versión precomprimida si el cliente acepta gzip
+            gzipped = False
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                gz = _open_fresh_gzip(f)
+                if gz is not None:
+                    f.close()
+                    f, gzipped = gz, True
+
+            # Servir el JSON sin cargarlo en memoria: tamaño desde fstat y
+            # cuerpo con socket.sendfile (os.sendfile si está disponible,
+            # send() en bloques si no)
+            with f:
+                size, etag, last_modified = _file_validators(f)
+
+                # El cliente ya tiene esta versión: 304 sin cuerpo
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                    self.send_header("Cache-Control", "no-cache")
+                    self.send_header("Vary", "Accept-Encoding")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                if gzipped:
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(size))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                self.connection.sendfile(f, 0, size)
             
         except BrokenPipeError:
             # Cliente cerró la conexión, ignorar
@@ -105,8 +228,9 @@ def start_http_server() -> None:
     """
     Inicia el servidor HTTP en el puerto configurado.
     
-    Lee HTTP_PORT del entorno (default: 8000) e inicia un servidor
-    ThreadingTCPServer que puede manejar múltiples conexiones simultáneas.
+    Usa HTTP_PORT (leído al importar, default: 8000) e inicia un servidor
+    ThreadingHTTPServer que puede manejar múltiples conexiones simultáneas
+    (hilos daemon, SO_REUSEADDR incluido).
     
     Esta función bloquea indefinidamente (serve_forever).
     Debe ser llamada en un hilo separado.
@@ -114,18 +238,10 @@ def start_http_server() -> None:
     Environment Variables:
         HTTP_PORT: Puerto en el que escuchar (default: 8000)
     """
-    port_str = os.getenv("HTTP_PORT", "8000")
-    try:
-        port = int(port_str)
-    except ValueError:
-        logger.warning(f"HTTP_PORT inválido ({port_str}), usando 8000 por defecto.")
-        port = 8000
+    port = _HTTP_PORT
 
-    # Permitir reutilizar el puerto inmediatamente después de cerrar
-    socketserver.ThreadingTCPServer.allow_reuse_address = True
-    
     try:
-        server = socketserver.ThreadingTCPServer(("0.0.0.0", port), JSONRequestHandler)
+        server = http.server.ThreadingHTTPServer(("0.0.0.0", port), JSONRequestHandler)
         logger.info(f"Servidor HTTP iniciado en puerto {port}")
         server.serve_forever()
     except OSError as e:
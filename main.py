@@ -7,7 +7,7 @@ Es el punto de entrada para ejecutar el scraping manualmente o desde el schedule
 Responsabilidades:
     - Cargar configuración desde variables de entorno
     - Inicializar el WebDriver de Firefox/Geckodriver
-    - Ejecutar dinámicamente cada módulo de banco
+    - Ejecutar dinámicamente cada módulo de banco (en paralelo, un driver por banco)
     - Agregar metadatos (logos) a los resultados
     - Guardar el resultado consolidado en JSON
 
@@ -17,12 +17,17 @@ Uso:
     Requiere que BANKS esté configurado en .env con los módulos a ejecutar.
     Ejemplo: BANKS=brou_personas,oca
 """
+import gzip
 import json
 import os
+import tempfile
 import importlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
 from typing import Optional
 
 from dotenv import load_dotenv
@@ -60,6 +65,10 @@ class RunConfig:
         headless: Si True, ejecuta Firefox sin interfaz gráfica.
         output_json: Ruta del archivo JSON de salida.
         gecko_logs: Si True, habilita logs detallados de Geckodriver.
+        lean_firefox: Si True, Firefox no carga imágenes, medios, etc.
+        page_load_timeout: Timeout (segundos) de navegación de Firefox.
+        max_workers: Cantidad máxima de bancos a procesar en paralelo.
+        pretty_json: Si True, escribe el JSON de salida indentado.
         mqtt_enabled: Si True, publica resultados via MQTT.
         mqtt_topic_prefix: Prefijo para los tópicos MQTT.
         mqtt_broker: IP/hostname del broker MQTT.
@@ -71,6 +80,10 @@ class RunConfig:
     headless: bool
     output_json: str
     gecko_logs: bool
+    lean_firefox: bool = True
+    page_load_timeout: int = 30
+    max_workers: int = 2
+    pretty_json: bool = False
     mqtt_enabled: bool = False
     mqtt_topic_prefix: str = "banks"
     mqtt_broker: str = ""
@@ -108,6 +121,14 @@ def load_config() -> RunConfig:
     # Configuración de Firefox
     headless = os.getenv("HEADLESS", "1").strip() == "1"
     gecko_logs = os.getenv("GECKODRIVER_LOGS", "0").strip() == "1"
+    lean_firefox = os.getenv("LEAN_FIREFOX", "1").strip() == "1"
+    page_load_timeout = int(os.getenv("PAGE_LOAD_TIMEOUT", "30").strip())
+
+    # Paralelismo (cada worker levanta su propio Firefox)
+    max_workers = max(1, int(os.getenv("MAX_WORKERS", "2").strip()))
+
+    # JSON de salida indentado (solo para lectura humana/depuración)
+    pretty_json = os.getenv("PRETTY_JSON", "0").strip() == "1"
 
     # Configuración MQTT
     mqtt_enabled = os.getenv("MQTT_ENABLED", "false").lower() == "true"
@@ -122,6 +143,10 @@ def load_config() -> RunConfig:
         headless=headless,
         output_json=OUTPUT_JSON,
         gecko_logs=gecko_logs,
+        lean_firefox=lean_firefox,
+        page_load_timeout=page_load_timeout,
+        max_workers=max_workers,
+        pretty_json=pretty_json,
         mqtt_enabled=mqtt_enabled,
         mqtt_topic_prefix=mqtt_topic_prefix,
         mqtt_broker=mqtt_broker,
@@ -135,17 +160,29 @@ def load_config() -> RunConfig:
 # GESTIÓN DEL WEBDRIVER
 # =============================================================================
 
-def make_driver(headless: bool, gecko_logs: bool, gecko_log_path: str) -> webdriver.Firefox:
+def make_driver(
+    headless: bool,
+    gecko_logs: bool,
+    gecko_log_path: str,
+    lean: bool = True,
+    page_load_timeout: int = 30,
+) -> webdriver.Firefox:
     """
     Configura e inicializa el WebDriver de Firefox.
     
     Crea una instancia de Firefox con las opciones necesarias para
-    ejecutarse en un contenedor Docker (no-sandbox, disable-dev-shm-usage).
+    ejecutarse en un contenedor Docker (no-sandbox, disable-dev-shm-usage)
+    y con pageLoadStrategy "none" (las esperas son siempre explícitas).
+    En modo lean desactiva imágenes, autoplay, WebGL, animaciones,
+    prefetch y la cache en disco.
     
     Args:
         headless: Si True, ejecuta sin interfaz gráfica.
         gecko_logs: Si True, habilita logs detallados de Geckodriver.
         gecko_log_path: Ruta del archivo de log para Geckodriver.
+        lean: Si True, aplica las preferencias que recortan carga
+              irrelevante para el scraping (LEAN_FIREFOX).
+        page_load_timeout: Timeout (segundos) de navegación (PAGE_LOAD_TIMEOUT).
         
     Returns:
         webdriver.Firefox: Instancia del driver lista para usar.
@@ -159,6 +196,25 @@ def make_driver(headless: bool, gecko_logs: bool, gecko_log_path: str) -> webdri
     if headless:
         opts.add_argument("-headless")
 
+    # driver.get() retorna apenas inicia la navegación, sin esperar el
+    # evento load (imágenes, trackers, etc.). Los scrapers ya esperan
+    # elementos concretos con WebDriverWait antes de interactuar.
+    opts.page_load_strategy = "none"
+
+    if lean:
+        # Recortar carga irrelevante para el scraping (imágenes, medios, WebGL)
+        opts.set_preference("permissions.default.image", 2)
+        opts.set_preference("media.autoplay.default", 5)
+        opts.set_preference("webgl.disabled", True)
+        opts.set_preference("dom.webnotifications.enabled", False)
+        # Sin animaciones CSS ni prefetch de DNS/enlaces
+        opts.set_preference("ui.prefersReducedMotion", 1)
+        opts.set_preference("network.dns.disablePrefetch", True)
+        opts.set_preference("network.prefetch-next", False)
+        # Cache solo en memoria (el perfil es descartable)
+        opts.set_preference("browser.cache.disk.enable", False)
+        opts.set_preference("browser.cache.memory.enable", True)
+
     # Configuración del servicio Geckodriver
     service_kwargs = {}
     if gecko_logs:
@@ -168,27 +224,212 @@ def make_driver(headless: bool, gecko_logs: bool, gecko_log_path: str) -> webdri
         service_kwargs["log_output"] = os.devnull
 
     service = FirefoxService(**service_kwargs)
-    driver = webdriver.Firefox(options=opts, service=service)
-    driver.set_page_load_timeout(60)
+    # keep_alive: una sola conexión HTTP persistente a geckodriver para
+    # todos los comandos (explícito; es el default de Selenium 4)
+    driver = webdriver.Firefox(options=opts, service=service, keep_alive=True)
+    driver.set_page_load_timeout(page_load_timeout)
+    # Sin implicit wait: una búsqueda negativa (ej: un modal que no está)
+    # retorna de inmediato; los scrapers usan esperas explícitas
+    driver.implicitly_wait(0)
     
     return driver
 
 
+class DriverPool:
+    """
+    Pool de WebDrivers de Firefox reutilizables entre bancos de una corrida.
+    
+    Evita pagar el arranque en frío de Firefox/Geckodriver por cada banco.
+    Entre usos se limpian cookies y storage, y el banco siguiente corre en
+    una pestaña nueva (se cierran todas las anteriores). main() crea un
+    pool por corrida y lo cierra al terminar, así que la reutilización
+    solo ocurre dentro de una misma corrida cuando hay más bancos que
+    workers: con MAX_WORKERS=1 todos los bancos comparten un único Firefox,
+    y con MAX_WORKERS >= cantidad de bancos cada banco tiene el suyo. Entre
+    corridas (horas de diferencia) no queda ningún Firefox ocioso ocupando
+    memoria. Un driver cuyo scrape falló se descarta en lugar de reusarse.
+    
+    Es thread-safe: cada worker toma un driver con acquire() y lo
+    devuelve con release().
+    
+    Attributes:
+        headless: Si True, los drivers se crean sin interfaz gráfica.
+        gecko_logs: Si True, habilita logs detallados de Geckodriver.
+        log_dir: Directorio donde se escriben los logs de Geckodriver.
+        lean: Si True, los drivers se crean con las preferencias "lean".
+        page_load_timeout: Timeout (segundos) de navegación de los drivers.
+    """
+
+    def __init__(
+        self,
+        headless: bool,
+        gecko_logs: bool,
+        log_dir: Path,
+        lean: bool = True,
+        page_load_timeout: int = 30,
+    ):
+        self.headless = headless
+        self.gecko_logs = gecko_logs
+        self.log_dir = log_dir
+        self.lean = lean
+        self.page_load_timeout = page_load_timeout
+        self._lock = threading.Lock()
+        self._idle: list[webdriver.Firefox] = []
+        self._all: list[webdriver.Firefox] = []
+        self._created = 0
+
+    def acquire(self) -> webdriver.Firefox:
+        """
+        Toma un driver libre del pool o crea uno nuevo.
+        
+        Returns:
+            webdriver.Firefox: Driver listo para usar.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+            n = self._created
+
+        gecko_log_file = str(self.log_dir / f"geckodriver_{n}.log")
+        driver = make_driver(
+            self.headless, self.gecko_logs, gecko_log_file, self.lean, self.page_load_timeout
+        )
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver: webdriver.Firefox, healthy: bool = True) -> None:
+        """
+        Devuelve un driver al pool, o lo descarta si el scrape falló.
+        
+        Args:
+            driver: Driver obtenido con acquire().
+            healthy: False si el scrape falló (el driver se descarta).
+        """
+        if healthy:
+            try:
+                self._reset(driver)
+            except Exception:
+                healthy = False
+
+        if not healthy:
+            self._discard(driver)
+            return
+
+        with self._lock:
+            self._idle.append(driver)
+
+    def close(self) -> None:
+        """Cierra todos los drivers creados por el pool."""
+        with self._lock:
+            drivers, self._all, self._idle = self._all, [], []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _reset(driver: webdriver.Firefox) -> None:
+        """
+        Deja el driver listo para otro banco: limpia cookies/storage del
+        sitio actual y reemplaza todas las pestañas por una nueva en blanco.
+        """
+        driver.delete_all_cookies()
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+
+    def _discard(self, driver: webdriver.Firefox) -> None:
+        """Cierra un driver y lo saca del pool."""
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
 # =============================================================================
 # EJECUCIÓN DE SCRAPERS
 # =============================================================================
 
-def run_bank_scraper(bank_module: str, cfg: RunConfig) -> dict:
+_host_locks: dict[str, threading.Lock] = {}
+"""Locks por sitio, para no abrir sesiones simultáneas contra el mismo portal."""
+
+_host_locks_guard = threading.Lock()
+
+
+def _host_lock(mod) -> threading.Lock:
+    """
+    Retorna el lock asociado al sitio de un módulo de banco.
+    
+    Los módulos pueden declarar BANK_HOST para indicar que comparten
+    portal con otro banco (ej: personas/empresas del mismo banco).
+    Si no lo declaran, se usa BANK_KEY (un lock por banco).
+    
+    Args:
+        mod: Módulo de banco importado.
+        
+    Returns:
+        threading.Lock: Lock compartido por todos los bancos del mismo sitio.
+    """
+    host = getattr(mod, "BANK_HOST", None) or getattr(mod, "BANK_KEY", mod.__name__)
+    with _host_locks_guard:
+        return _host_locks.setdefault(host, threading.Lock())
+
+
+def import_bank_modules(banks: list[str]) -> tuple[dict[str, ModuleType], dict[str, dict]]:
     """
-    Importa y ejecuta dinámicamente el módulo de un banco.
+    Importa los módulos de todos los bancos configurados.
+    
+    Se llama una vez antes de lanzar los workers, así la fase concurrente
+    no compite por el import lock de Python.
+    
+    Args:
+        banks: Nombres de los módulos en banks/ (sin extensión).
+        
+    Returns:
+        tuple: (módulos importados por banco, resultados de error por banco
+               para los que no se pudieron importar).
+    """
+    modules: dict[str, ModuleType] = {}
+    errors: dict[str, dict] = {}
+    for bank_module in banks:
+        module_path = f"banks.{bank_module}"
+        try:
+            modules[bank_module] = importlib.import_module(module_path)
+        except Exception as e:
+            msg = f"No se pudo importar el módulo {module_path}: {e}"
+            logger.error(msg)
+            errors[bank_module] = {"error": msg}
+    return modules, errors
+
+
+def run_bank_scraper(bank_module: str, mod: ModuleType, cfg: RunConfig, pool: DriverPool) -> dict:
+    """
+    Ejecuta el módulo (ya importado) de un banco.
     
     Cada banco tiene su propio módulo en banks/ con una función run().
-    Esta función lo importa, ejecuta el scraping, y agrega metadatos
-    como el logo a los resultados.
+    Esta función ejecuta el scraping y agrega metadatos como el logo
+    a los resultados.
+    
+    Es segura para ejecutarse en paralelo: cada invocación toma un
+    WebDriver exclusivo del pool y solo comparte el lock del sitio con
+    otros bancos del mismo host.
     
     Args:
         bank_module: Nombre del módulo en banks/ (sin extensión).
+        mod: Módulo del banco (ver import_bank_modules()).
         cfg: Configuración de ejecución.
+        pool: Pool de WebDrivers compartido por los workers.
         
     Returns:
         dict: Resultado del scraping con formato:
@@ -199,25 +440,16 @@ def run_bank_scraper(bank_module: str, cfg: RunConfig) -> dict:
         En caso de error:
             - error: Mensaje de error descriptivo
     """
-    module_path = f"banks.{bank_module}"
     driver: Optional[webdriver.Firefox] = None
-    
-    # Intentar importar el módulo
-    try:
-        mod = importlib.import_module(module_path)
-    except Exception as e:
-        msg = f"No se pudo importar el módulo {module_path}: {e}"
-        logger.error(msg)
-        return {"error": msg}
+    healthy = False
+
+    # Serializar bancos que comparten portal
+    host_lock = _host_lock(mod)
+    host_lock.acquire()
 
     try:
-        # Configurar path de logs por banco
-        log_dir = Path("./logs").resolve()
-        log_dir.mkdir(parents=True, exist_ok=True)
-        gecko_log_file = str(log_dir / f"geckodriver_{bank_module}.log")
-        
         logger.info(f"Iniciando scraper para: {bank_module}")
-        driver = make_driver(cfg.headless, cfg.gecko_logs, gecko_log_file)
+        driver = pool.acquire()
         
         # Ejecutar el scraper del banco
         bank_data = mod.run(driver=driver, env=os.environ)
@@ -228,12 +460,13 @@ def run_bank_scraper(bank_module: str, cfg: RunConfig) -> dict:
             bank_data["logo"] = bank_logo
         
         # Agregar logo a cada cuenta (si no tiene uno propio)
-        if "accounts" in bank_data and isinstance(bank_data["accounts"], list):
-            for acc in bank_data["accounts"]:
-                acc_logo = acc.get("logo") or bank_logo
-                if acc_logo:
-                    acc["logo"] = acc_logo
+        accounts = bank_data.get("accounts")
+        if bank_logo and isinstance(accounts, list):
+            for acc in accounts:
+                if not acc.get("logo"):
+                    acc["logo"] = bank_logo
         
+        healthy = True
         logger.info(f"Éxito: {bank_module} procesado correctamente")
         return bank_data
 
@@ -243,19 +476,52 @@ def run_bank_scraper(bank_module: str, cfg: RunConfig) -> dict:
         return {"error": msg}
     finally:
         if driver:
-            driver.quit()
+            pool.release(driver, healthy=healthy)
+        host_lock.release()
 
 
 # =============================================================================
 # PUNTO DE ENTRADA
 # =============================================================================
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Escribe un archivo de forma atómica.
+    
+    Escribe a un temporal en el mismo directorio y lo renombra sobre el
+    destino (os.replace), así quien lea el archivo (ej: el servidor HTTP)
+    nunca ve un JSON a medio escribir. El temporal se sincroniza (fsync)
+    antes del rename, así un corte abrupto deja la versión anterior o la
+    nueva completa, nunca un archivo truncado.
+    
+    Args:
+        path: Ruta destino.
+        data: Contenido a escribir.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            # Asegurar el contenido en disco antes del rename (crash-safe)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 def main() -> None:
     """
     Punto de entrada principal del orquestador.
     
     Carga la configuración, ejecuta todos los scrapers configurados
-    en BANKS, y guarda el resultado consolidado en el archivo JSON.
+    en BANKS en paralelo (hasta MAX_WORKERS a la vez), y guarda el
+    resultado consolidado en el archivo JSON.
     """
     cfg = load_config()
 
@@ -269,17 +535,45 @@ def main() -> None:
         "banks": {}
     }
 
-    # Ejecutar cada banco configurado
+    # Pool de drivers compartido (a lo sumo uno por worker)
+    log_dir = Path("./logs").resolve()
+    log_dir.mkdir(parents=True, exist_ok=True)
+    pool = DriverPool(
+        cfg.headless, cfg.gecko_logs, log_dir, cfg.lean_firefox, cfg.page_load_timeout
+    )
+
+    # Importar todos los módulos antes de lanzar los workers
+    modules, results = import_bank_modules(cfg.banks)
+
+    # Ejecutar los bancos configurados en paralelo (un driver por worker)
+    workers = min(cfg.max_workers, len(modules))
+    try:
+        if workers <= 1:
+            # Secuencial en el hilo principal (MAX_WORKERS=1, útil para depurar)
+            for bank_id, mod in modules.items():
+                results[bank_id] = run_bank_scraper(bank_id, mod, cfg, pool)
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank") as ex:
+                futures = {
+                    ex.submit(run_bank_scraper, bank_id, mod, cfg, pool): bank_id
+                    for bank_id, mod in modules.items()
+                }
+                for fut in as_completed(futures):
+                    results[futures[fut]] = fut.result()
+    finally:
+        pool.close()
+
+    # Mantener el orden declarado en BANKS
     for bank_id in cfg.banks:
-        bank_result = run_bank_scraper(bank_id, cfg)
-        final_result["banks"][bank_id] = bank_result
+        final_result["banks"][bank_id] = results[bank_id]
 
-    # Guardar resultado en JSON
+    # Guardar resultado en JSON (y su versión gzip para el servidor HTTP).
+    # El .gz se escribe después, así nunca queda más nuevo que un JSON viejo.
     try:
-        out_path.write_text(
-            json.dumps(final_result, ensure_ascii=False, indent=2), 
-            encoding="utf-8"
-        )
+        indent = 2 if cfg.pretty_json else None
+        content = json.dumps(final_result, ensure_ascii=False, indent=indent).encode("utf-8")
+        _write_atomic(out_path, content)
+        _write_atomic(out_path.with_name(out_path.name + ".gz"), gzip.compress(content, compresslevel=6))
         logger.info(f"Proceso finalizado. Resultado guardado en: {out_path}")
     except Exception as e:
         logger.error(f"No se pudo escribir el archivo de salida: {e}")
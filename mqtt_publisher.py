@@ -23,14 +23,202 @@ Uso:
 import json
 import logging
 import os
+import socket
+import threading
 import time
+from functools import lru_cache
+from itertools import groupby
 import paho.mqtt.client as mqtt
 
-from banks.common import normalize_currency
+from banks.common import normalize_currency_code
 
 logger = logging.getLogger(__name__)
 
 
+# =============================================================================
+# CONFIGURACIÓN
+# =============================================================================
+
+QOS_META = 0
+"""QoS de config y atributos: retained y se republican periódicamente, así
+   que no justifican el PUBACK por mensaje de QoS 1."""
+
+QOS_STATE = 1
+"""QoS de los estados (el valor que consume Home Assistant)."""
+
+MQTT_CONNECT_TIMEOUT = 5.0
+"""Timeout (segundos) para establecer la conexión con el broker."""
+
+MQTT_PUBLISH_TIMEOUT = 10.0
+"""Tiempo máximo (segundos) para que se confirmen los mensajes de un ciclo."""
+
+MQTT_MAX_INFLIGHT = 200
+"""Mensajes QoS>0 sin PUBACK permitidos en vuelo (paho usa 20 por defecto)."""
+
+MQTT_FULL_REPUBLISH_SEC = 900
+"""Cada cuánto (segundos) se republican todos los tópicos aunque no hayan
+   cambiado, por si el broker perdió los mensajes retained (ej: reinicio)."""
+
+TOPIC_CONFIG = "/config"
+"""Sufijo del tópico de configuración de autodiscovery."""
+
+TOPIC_STATE = "/state"
+"""Sufijo del tópico de estado. Lleva estado y atributos en un mismo JSON
+   ({"state": ..., "attributes": {...}}): un mensaje por entidad en vez de dos."""
+
+TOPIC_LEGACY_ATTRIBUTES = "/attributes"
+"""Sufijo del antiguo tópico de atributos (hoy van en /state). Se publica
+   vacío y retained una vez por proceso, para que el broker descarte el
+   último valor que guardaba (ver _legacy_cleanup)."""
+
+VALUE_TEMPLATE = "{{ value_json.state }}"
+"""Template de Home Assistant que extrae el estado del payload combinado."""
+
+ATTRIBUTES_TEMPLATE = "{{ value_json.attributes | tojson }}"
+"""Template de Home Assistant que extrae los atributos del payload combinado."""
+
+_json_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+"""Serializador JSON compacto para los payloads: sin espacios, UTF-8 directo
+   en lugar de escapes ASCII, y sin reconstruir el encoder en cada llamada."""
+
+_AMOUNT_FIELDS = frozenset(("balance", "available"))
+"""Campos de cuenta con objetos {raw, number} que se aplanan para HA."""
+
+_AMOUNT_NULL_DEFAULTS = {"raw": "---"}
+"""Default de los subcampos null de un monto (el resto, ej: number, usa 0)."""
+
+Message = tuple[str, str, int]
+"""Mensaje a publicar: (tópico, payload, QoS). Todos se publican retained."""
+
+_ID_TRANSLATE = str.maketrans({" ": "_", "(": None, ")": None, "-": "_"})
+"""Sanitización de IDs en una sola pasada: espacios y guiones → "_", sin paréntesis."""
+
+
+# =============================================================================
+# ESTADO DE PUBLICACIÓN
+# =============================================================================
+
+_last_published: dict[str, str] = {}
+"""Último payload publicado por tópico (solo de ciclos completados con éxito)."""
+
+_pending: dict[str, str] = {}
+"""Payloads enviados en el ciclo en curso; se confirman en _last_published al terminar."""
+
+_inflight: list[mqtt.MQTTMessageInfo] = []
+"""Mensajes enviados en el ciclo en curso, para esperar su confirmación."""
+
+_last_full_publish = 0.0
+"""Instante (time.monotonic) del último ciclo que republicó todos los tópicos."""
+
+_client: mqtt.Client | None = None
+"""Cliente MQTT persistente, compartido entre ciclos (se crea en el primero)."""
+
+_connected = threading.Event()
+"""Activo mientras la sesión con el broker está establecida (CONNACK recibido)."""
+
+_legacy_cleared: set[str] = set()
+"""Tópicos de atributos antiguos ya vaciados (confirmados) en este proceso."""
+
+_session_reset = threading.Event()
+"""Se activa en cada (re)conexión: el broker pudo haber perdido los retained,
+   así que el próximo ciclo republica todo."""
+
+
+def _on_connect(client, userdata, flags, reason_code, properties=None):
+    """Callback de conexión: marca la sesión como activa si el broker la aceptó."""
+    if reason_code == 0:
+        _session_reset.set()
+        _connected.set()
+
+
+def _on_disconnect(client, userdata, *args):
+    """Callback de desconexión: paho reconecta solo; hasta entonces no se publica."""
+    _connected.clear()
+
+
+def _on_socket_open(client, userdata, sock):
+    """
+    Callback de apertura del socket (en cada conexión y reconexión).
+    
+    Desactiva Nagle (TCP_NODELAY): el ciclo envía ráfagas de mensajes
+    chicos y los PUBACK de QoS 1 no deben esperar a que el kernel
+    acumule más datos.
+    """
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except (AttributeError, OSError) as e:
+        # Sockets no TCP (ej: websockets/proxy): se ignora
+        logger.debug(f"No se pudo activar TCP_NODELAY: {e}")
+
+
+def _get_client(broker: str, port: int, user: str | None, password: str | None) -> mqtt.Client:
+    """
+    Devuelve el cliente MQTT persistente, creándolo en la primera llamada.
+    
+    La conexión se mantiene abierta entre ciclos (el scheduler republica
+    cada 60s), evitando el handshake TCP + CONNECT/CONNACK de cada vez.
+    El hilo de red de paho (loop_start) reconecta automáticamente si la
+    conexión se cae.
+    
+    Args:
+        broker: IP/hostname del broker.
+        port: Puerto del broker.
+        user: Usuario para autenticación (opcional).
+        password: Contraseña para autenticación (opcional).
+        
+    Returns:
+        mqtt.Client: Cliente con el hilo de red iniciado.
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    # Usar API v2 de paho-mqtt si está disponible
+    try:
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+    except AttributeError:
+        client = mqtt.Client()
+
+    if user and password:
+        client.username_pw_set(user, password)
+    client.connect_timeout = MQTT_CONNECT_TIMEOUT
+    client.reconnect_delay_set(min_delay=1, max_delay=60)
+    # Ventana amplia de mensajes en vuelo: los QoS 1 no esperan PUBACK de a 20
+    client.max_inflight_messages_set(MQTT_MAX_INFLIGHT)
+    client.max_queued_messages_set(0)  # Cola sin límite
+    if logger.isEnabledFor(logging.DEBUG):
+        client.enable_logger(logger)
+    client.on_connect = _on_connect
+    client.on_disconnect = _on_disconnect
+    client.on_socket_open = _on_socket_open
+
+    # Conexión asíncrona: el hilo de red conecta (y reconecta) en segundo plano
+    client.connect_async(broker, port, 60)
+    client.loop_start()
+    _client = client
+    return client
+
+
+def _publish(client, topic: str, payload: str, qos: int) -> None:
+    """
+    Publica un mensaje retained, salvo que el payload no haya cambiado.
+    
+    Home Assistant ya tiene el último valor retained de cada tópico, así
+    que repetir el mismo payload cada 60s solo genera tráfico. Cada
+    MQTT_FULL_REPUBLISH_SEC se fuerza una republicación completa.
+    
+    Args:
+        client: Cliente MQTT conectado.
+        topic: Tópico destino.
+        payload: Contenido del mensaje.
+        qos: Nivel de QoS.
+    """
+    if _last_published.get(topic) == payload:
+        return
+    _inflight.append(client.publish(topic, payload, retain=True, qos=qos))
+    _pending[topic] = payload
+
+
 # =============================================================================
 # FUNCIONES AUXILIARES
 # =============================================================================
@@ -55,17 +243,11 @@ def _remove_consecutive_duplicates(text: str, separator: str = "_") -> str:
         >>> _remove_consecutive_duplicates("bank_bank_bank_test")
         'bank_test'
     """
-    if not text:
-        return text
-    parts = text.split(separator)
-    result = [parts[0]] if parts else []
-    for part in parts[1:]:
-        if part != result[-1]:
-            result.append(part)
-    return separator.join(result)
+    # groupby agrupa las repeticiones consecutivas; se conserva una de cada
+    return separator.join(part for part, _ in groupby(text.split(separator)))
 
 
-def _flatten_for_mqtt(account: dict) -> dict:
+def _flatten_for_mqtt(account: dict, **extra) -> dict:
     """
     Aplana un objeto de cuenta para compatibilidad con Home Assistant.
     
@@ -75,6 +257,8 @@ def _flatten_for_mqtt(account: dict) -> dict:
     
     Args:
         account: Diccionario de cuenta con posibles objetos anidados.
+        **extra: Campos adicionales a agregar al final (ej: bank,
+                 last_updated), sin crear un segundo dict.
         
     Returns:
         dict: Cuenta con campos aplanados.
@@ -88,146 +272,283 @@ def _flatten_for_mqtt(account: dict) -> dict:
     """
     result = {}
     for key, value in account.items():
-        if isinstance(value, dict) and key in ("balance", "available"):
+        if value is None:
+            result[key] = "---"
+        elif key in _AMOUNT_FIELDS and isinstance(value, dict):
             # Aplanar: balance → balance_raw, balance_number
             for subkey, subvalue in value.items():
-                flat_key = f"{key}_{subkey}"
                 # Convertir null a defaults sensatos
-                if subvalue is None:
-                    result[flat_key] = "---" if subkey == "raw" else 0
-                else:
-                    result[flat_key] = subvalue
-        elif value is None:
-            result[key] = "---"
+                result[f"{key}_{subkey}"] = (
+                    _AMOUNT_NULL_DEFAULTS.get(subkey, 0) if subvalue is None else subvalue
+                )
         else:
             result[key] = value
+    result.update(extra)
     return result
 
 
 # =============================================================================
-# PUBLICACIÓN DE ENTIDADES
+# IDS Y CONFIGURACIÓN DE AUTODISCOVERY
 # =============================================================================
 
-def _publish_bank_status(client, bank_name: str, bank_data: dict, updated_at: str = None) -> None:
+@lru_cache(maxsize=64)
+def _bank_status_ids(bank_name: str, prefix: str) -> tuple[str, str]:
     """
-    Publica el estado general de un banco como binary_sensor.
-    
-    Crea un binary_sensor con device_class "problem" que indica
-    si el scraping del banco fue exitoso o falló.
+    Calcula el ID y el tópico base del estado de un banco.
     
     Args:
-        client: Cliente MQTT conectado.
         bank_name: Nombre identificador del banco.
-        bank_data: Datos del banco (puede contener "error").
-        updated_at: Timestamp de la última actualización.
+        prefix: Prefijo de tópicos (MQTT_TOPIC_PREFIX).
+        
+    Returns:
+        tuple[str, str]: (safe_bank_id, base_topic).
     """
-    prefix = os.getenv("MQTT_TOPIC_PREFIX", "banks").strip()
     safe_bank_id = f"{bank_name}_status".lower().replace(" ", "_")
-    base_topic = f"homeassistant/binary_sensor/{prefix}/{safe_bank_id}"
+    return safe_bank_id, f"homeassistant/binary_sensor/{prefix}/{safe_bank_id}"
+
+
+@lru_cache(maxsize=1024)
+def _account_ids(bank_name: str, account_num: str, currency_raw: str, prefix: str) -> tuple[str, str]:
+    """
+    Calcula el ID único y el tópico base de una cuenta.
+    
+    Es una función pura de la identidad de la cuenta, que no cambia entre
+    republicaciones: se memoiza para no repetir la normalización de
+    moneda y la sanitización en cada ciclo.
+    
+    Args:
+        bank_name: Nombre identificador del banco.
+        account_num: Número o identificador de la cuenta.
+        currency_raw: Moneda tal como la reporta el banco.
+        prefix: Prefijo de tópicos (MQTT_TOPIC_PREFIX).
+        
+    Returns:
+        tuple[str, str]: (safe_id, base_topic).
+    """
+    currency = normalize_currency_code(currency_raw)
+    
+    # Construir ID único: bank_account_currency
+    raw_id = f"{bank_name}_{account_num}_{currency}".lower()
+    # Sanitizar caracteres especiales
+    safe_id = raw_id.translate(_ID_TRANSLATE)
+    # Eliminar redundancias (ej: oca_oca_blue → oca_blue)
+    safe_id = _remove_consecutive_duplicates(safe_id)
+    
+    return safe_id, f"homeassistant/sensor/{prefix}/{safe_id}"
+
+
+def _device(bank_name: str) -> dict:
+    """
+    Construye el bloque "device" que agrupa las entidades de un banco en HA.
+    
+    Args:
+        bank_name: Nombre identificador del banco.
+        
+    Returns:
+        dict: Identificadores, nombre y fabricante del dispositivo.
+    """
+    return {
+        "identifiers": [f"bank_{bank_name}"],
+        "name": bank_name.replace('_', ' ').title(),
+        "manufacturer": "Bank Scraper"
+    }
+
+
+@lru_cache(maxsize=64)
+def _bank_status_config(bank_name: str, safe_bank_id: str, state_topic: str) -> str:
+    """
+    Serializa la configuración de autodiscovery del estado de un banco.
     
-    is_error = isinstance(bank_data, dict) and "error" in bank_data
+    Solo depende de la identidad del banco, así que se arma y serializa
+    una vez por proceso y no en cada republicación.
     
-    # Configuración de autodiscovery
-    config = {
+    Args:
+        bank_name: Nombre identificador del banco.
+        safe_bank_id: ID único de la entidad.
+        state_topic: Tópico combinado de estado y atributos.
+        
+    Returns:
+        str: Config en JSON, lista para publicar.
+    """
+    return _json_dumps({
         "name": f"{bank_name.replace('_', ' ').title()} Status",
         "unique_id": safe_bank_id,
-        "state_topic": f"{base_topic}/state",
+        "state_topic": state_topic,
+        "value_template": VALUE_TEMPLATE,
         "device_class": "problem",
-        "json_attributes_topic": f"{base_topic}/attributes",
-        "device": {
-            "identifiers": [f"bank_{bank_name}"],
-            "name": bank_name.replace('_', ' ').title(),
-            "manufacturer": "Bank Scraper"
-        }
-    }
+        "json_attributes_topic": state_topic,
+        "json_attributes_template": ATTRIBUTES_TEMPLATE,
+        "device": _device(bank_name),
+    })
+
+
+@lru_cache(maxsize=1024)
+def _account_config(bank_name: str, account_num: str, unit: str, safe_id: str, state_topic: str) -> str:
+    """
+    Serializa la configuración de autodiscovery de una cuenta.
+    
+    Solo depende de la identidad de la cuenta, así que se arma y serializa
+    una vez por proceso y no en cada republicación.
+    
+    Args:
+        bank_name: Nombre identificador del banco.
+        account_num: Número o identificador de la cuenta.
+        unit: Unidad de medida (moneda tal como la reporta el banco).
+        safe_id: ID único de la entidad.
+        state_topic: Tópico combinado de estado y atributos.
+        
+    Returns:
+        str: Config en JSON, lista para publicar.
+    """
+    return _json_dumps({
+        "name": f"{bank_name.replace('_', ' ').title()} {account_num}",
+        "unique_id": safe_id,
+        "state_topic": state_topic,
+        "value_template": VALUE_TEMPLATE,
+        "json_attributes_topic": state_topic,
+        "json_attributes_template": ATTRIBUTES_TEMPLATE,
+        "unit_of_measurement": unit,
+        "device_class": "monetary",
+        "state_class": "measurement",
+        "icon": "mdi:bank",
+        "device": _device(bank_name),
+    })
+
+
+# =============================================================================
+# PUBLICACIÓN DE ENTIDADES
+# =============================================================================
+
+def _legacy_cleanup(base_topic: str) -> list[Message]:
+    """
+    Arma el borrado del tópico de atributos antiguo de una entidad.
+    
+    Es una migración única: una vez confirmado el payload vacío retained,
+    el tópico queda registrado en _legacy_cleared y no se vuelve a enviar
+    (ni siquiera en las republicaciones completas).
+    
+    Args:
+        base_topic: Tópico base de la entidad.
+        
+    Returns:
+        list[Message]: El mensaje de borrado, o vacía si ya se hizo.
+    """
+    topic = base_topic + TOPIC_LEGACY_ATTRIBUTES
+    if topic in _legacy_cleared:
+        return []
+    return [(topic, "", QOS_META)]
+
+
+def _bank_status_messages(bank_name: str, bank_data: dict, prefix: str, updated_at: str = None) -> list[Message]:
+    """
+    Arma los mensajes del estado general de un banco como binary_sensor.
+    
+    Crea un binary_sensor con device_class "problem" que indica
+    si el scraping del banco fue exitoso o falló.
+    
+    Args:
+        bank_name: Nombre identificador del banco.
+        bank_data: Datos del banco, siempre un dict (puede contener "error").
+        prefix: Prefijo de tópicos (MQTT_TOPIC_PREFIX).
+        updated_at: Timestamp de la última actualización.
+        
+    Returns:
+        list[Message]: Config, limpieza del tópico de atributos antiguo (si
+                       todavía no se hizo) y
+                       estado + atributos.
+    """
+    safe_bank_id, base_topic = _bank_status_ids(bank_name, prefix)
+    state_topic = base_topic + TOPIC_STATE
+    
+    is_error = "error" in bank_data
     
     # Estado: ON = problema, OFF = ok
     state = "ON" if is_error else "OFF"
     
-    # Publicar config, estado y atributos
-    client.publish(f"{base_topic}/config", json.dumps(config), retain=True, qos=1)
-    client.publish(f"{base_topic}/state", state, retain=True, qos=1)
-    
     attributes = {
         "error": bank_data.get("error") if is_error else None,
-        "updated_at": bank_data.get("updated_at") if isinstance(bank_data, dict) else None,
-        "last_updated": updated_at or bank_data.get("updated_at")
+        "updated_at": bank_data.get("updated_at"),
+        "last_updated": updated_at
     }
-    client.publish(f"{base_topic}/attributes", json.dumps(attributes), retain=True, qos=1)
+
+    # Config (y limpieza del tópico de atributos antiguo) y, en un solo
+    # mensaje, estado + atributos
+    return [
+        (base_topic + TOPIC_CONFIG, _bank_status_config(bank_name, safe_bank_id, state_topic), QOS_META),
+        *_legacy_cleanup(base_topic),
+        (state_topic, _json_dumps({"state": state, "attributes": attributes}), QOS_STATE),
+    ]
 
 
-def _publish_account(client, bank_name: str, account: dict, idx: int, updated_at: str = None) -> None:
+def _account_messages(bank_name: str, account: dict, idx: int, prefix: str, updated_at: str = None) -> list[Message]:
     """
-    Publica una cuenta individual como sensor monetario.
+    Arma los mensajes de una cuenta individual como sensor monetario.
     
     Crea un sensor con device_class "monetary" que muestra el saldo
     disponible (para cuentas) o el balance/consumos (para tarjetas).
     
     Args:
-        client: Cliente MQTT conectado.
         bank_name: Nombre identificador del banco.
         account: Diccionario con datos de la cuenta.
         idx: Índice de la cuenta (usado si no tiene account_number).
+        prefix: Prefijo de tópicos (MQTT_TOPIC_PREFIX).
         updated_at: Timestamp de la última actualización.
+        
+    Returns:
+        list[Message]: Config, limpieza del tópico de atributos antiguo (si
+                       todavía no se hizo) y
+                       estado + atributos.
     """
     account_num = account.get("account_number", f"account_{idx}")
-    currency = normalize_currency(account.get("currency", ""), output_format="code")
-    
-    # Construir ID único: bank_account_currency
-    raw_id = f"{bank_name}_{account_num}_{currency}".lower()
-    # Sanitizar caracteres especiales
-    safe_id = raw_id.replace(" ", "_").replace("(", "").replace(")", "").replace("-", "_")
-    # Eliminar redundancias (ej: oca_oca_blue → oca_blue)
-    safe_id = _remove_consecutive_duplicates(safe_id)
-    
-    prefix = os.getenv("MQTT_TOPIC_PREFIX", "banks").strip()
-    base_topic = f"homeassistant/sensor/{prefix}/{safe_id}"
+    safe_id, base_topic = _account_ids(bank_name, account_num, account.get("currency", ""), prefix)
+    state_topic = base_topic + TOPIC_STATE
 
-    # Configuración de autodiscovery
-    config = {
-        "name": f"{bank_name.replace('_', ' ').title()} {account_num}",
-        "unique_id": safe_id,
-        "state_topic": f"{base_topic}/state",
-        "json_attributes_topic": f"{base_topic}/attributes",
-        "unit_of_measurement": account.get("currency", "UYU"),
-        "device_class": "monetary",
-        "state_class": "measurement",
-        "icon": "mdi:bank",
-        "device": {
-            "identifiers": [f"bank_{bank_name}"],
-            "name": bank_name.replace('_', ' ').title(),
-            "manufacturer": "Bank Scraper"
-        }
-    }
-
-    # Publicar configuración
-    client.publish(f"{base_topic}/config", json.dumps(config), retain=True, qos=1)
+    # Configuración (serializada una sola vez por cuenta)
+    config = _account_config(bank_name, account_num, account.get("currency", "UYU"), safe_id, state_topic)
     
     # Estado: disponible para ACCOUNT, balance para CREDIT_CARD
     if account.get("type") == "CREDIT_CARD":
         state_value = account.get("balance", {}).get("number", 0)
     else:
         state_value = account.get("available", {}).get("number", 0)
-        
-    client.publish(f"{base_topic}/state", str(state_value), retain=True, qos=1)
     
     # Atributos: todos los datos de la cuenta aplanados
-    flattened_account = _flatten_for_mqtt(account)
-    attributes = {**flattened_account, "bank": bank_name, "last_updated": updated_at}
-    client.publish(f"{base_topic}/attributes", json.dumps(attributes), retain=True, qos=1)
+    attributes = _flatten_for_mqtt(account, bank=bank_name, last_updated=updated_at)
+
+    # Estado y atributos en un único mensaje (HA los separa con los templates)
+    return [
+        (base_topic + TOPIC_CONFIG, config, QOS_META),
+        *_legacy_cleanup(base_topic),
+        (state_topic, _json_dumps({"state": state_value, "attributes": attributes}), QOS_STATE),
+    ]
 
 
 # =============================================================================
 # FUNCIÓN PRINCIPAL
 # =============================================================================
 
-def publish_to_mqtt(data: dict) -> None:
+def republish_due() -> bool:
+    """
+    Indica si el próximo ciclo debe republicar todo aunque los datos no cambien.
+    
+    Es así al inicio, tras una (re)conexión o un ciclo fallido, y cada
+    MQTT_FULL_REPUBLISH_SEC. Permite al scheduler omitir el ciclo completo
+    (lectura del JSON incluida) cuando no hay nada nuevo que publicar.
+    
+    Returns:
+        bool: True si corresponde una republicación completa.
+    """
+    return _session_reset.is_set() or time.monotonic() - _last_full_publish >= MQTT_FULL_REPUBLISH_SEC
+
+
+def publish_to_mqtt(data: dict) -> bool:
     """
     Publica los datos del scraper a MQTT con Home Assistant Discovery.
     
-    Conecta al broker MQTT, publica el timestamp general, estado de
-    cada banco, y cada cuenta individual. Usa un bucle de eventos
-    asíncrono para garantizar que todos los mensajes se envíen.
+    Usa la conexión persistente con el broker (ver _get_client) y publica
+    el timestamp general, estado de cada banco, y cada cuenta individual.
+    En lugar de esperas fijas, espera la sesión activa y la confirmación
+    de cada mensaje (PUBACK en QoS 1), con timeouts acotados.
     
     Args:
         data: Diccionario con la estructura:
@@ -247,65 +568,81 @@ def publish_to_mqtt(data: dict) -> None:
         MQTT_USER: Usuario para autenticación
         MQTT_PASS: Contraseña para autenticación
         MQTT_TOPIC_PREFIX: Prefijo de tópicos (default: banks)
+        
+    Returns:
+        bool: True si el ciclo se completó (todos los mensajes confirmados).
     """
+    global _last_full_publish
+
     mqtt_broker = os.getenv("MQTT_BROKER")
     if not mqtt_broker:
         logger.info("MQTT_BROKER no configurado. Saltando publicación MQTT.")
-        return
+        return False
 
     mqtt_port = int(os.getenv("MQTT_PORT", "1883"))
     mqtt_user = os.getenv("MQTT_USER")
     mqtt_pass = os.getenv("MQTT_PASS")
+    prefix = os.getenv("MQTT_TOPIC_PREFIX", "banks").strip()
 
-    # Usar API v2 de paho-mqtt si está disponible
-    try:
-        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
-    except AttributeError:
-        client = mqtt.Client()
-
-    if mqtt_user and mqtt_pass:
-        client.username_pw_set(mqtt_user, mqtt_pass)
+    client = _get_client(mqtt_broker, mqtt_port, mqtt_user, mqtt_pass)
 
     try:
-        # Conexión asíncrona
-        client.connect(mqtt_broker, mqtt_port, 60)
-        client.loop_start()
-        
-        # Esperar conexión
-        time.sleep(1)
-
-        # Publicar timestamp general
-        client.publish(
-            "bank_scraper/last_update",
-            data.get("updated_at", ""),
-            retain=True,
-            qos=1
-        )
-
-        # Publicar cada banco
+        # Armar todos los mensajes del ciclo (mientras la sesión se establece)
+        # El timestamp general es informativo: QoS 0 (retained; el orden lo da TCP)
+        messages: list[Message] = [("bank_scraper/last_update", data.get("updated_at", ""), QOS_META)]
         for bank_name, bank_data in data.get("banks", {}).items():
+            # Normalizar una sola vez: de acá en más bank_data siempre es un dict
+            if not isinstance(bank_data, dict):
+                bank_data = {"error": "datos del banco con formato inválido"}
+
             # Obtener updated_at del banco o global
-            bank_updated_at = None
-            if isinstance(bank_data, dict):
-                bank_updated_at = bank_data.get("updated_at") or data.get("updated_at")
+            bank_updated_at = bank_data.get("updated_at") or data.get("updated_at")
             
             # Siempre publicar estado del banco
-            _publish_bank_status(client, bank_name, bank_data, bank_updated_at)
+            messages += _bank_status_messages(bank_name, bank_data, prefix, bank_updated_at)
             
             # Publicar cuentas si no hay error
-            if isinstance(bank_data, dict) and "error" not in bank_data:
-                accounts = bank_data.get("accounts", [])
-                for idx, account in enumerate(accounts):
-                    _publish_account(client, bank_name, account, idx, bank_updated_at)
-            elif isinstance(bank_data, dict) and "error" in bank_data:
+            if "error" in bank_data:
                 logger.warning(f"Banco {bank_name} reportó error: {bank_data['error']}. Publicando solo estado.")
+            else:
+                for idx, account in enumerate(bank_data.get("accounts", [])):
+                    messages += _account_messages(bank_name, account, idx, prefix, bank_updated_at)
 
-        # Esperar a que se envíen los mensajes
-        time.sleep(2)
-        
-        client.loop_stop()
-        client.disconnect()
-        logger.info("Publicación MQTT completada con éxito.")
+        # Esperar la sesión (inmediato si la conexión persistente sigue activa)
+        if not _connected.wait(MQTT_CONNECT_TIMEOUT):
+            raise ConnectionError("el broker no confirmó la conexión")
+
+        # Republicación completa periódica o tras (re)conectar (olvidar lo ya publicado)
+        now = time.monotonic()
+        full_republish = now - _last_full_publish >= MQTT_FULL_REPUBLISH_SEC or _session_reset.is_set()
+        if full_republish:
+            _session_reset.clear()
+            _last_published.clear()
+        _pending.clear()
+        _inflight.clear()
+
+        # Publicar todo en una sola pasada
+        for topic, payload, qos in messages:
+            _publish(client, topic, payload, qos)
+
+        # Esperar solo a los mensajes pendientes, con un deadline común
+        deadline = time.monotonic() + MQTT_PUBLISH_TIMEOUT
+        for info in _inflight:
+            info.wait_for_publish(max(0.0, deadline - time.monotonic()))
+        unconfirmed = sum(not info.is_published() for info in _inflight)
+        if unconfirmed:
+            raise TimeoutError(f"{unconfirmed} mensajes sin confirmar tras {MQTT_PUBLISH_TIMEOUT}s")
+
+        # Ciclo completo: recordar lo publicado para omitirlo si no cambia
+        _last_published.update(_pending)
+        _legacy_cleared.update(t for t in _pending if t.endswith(TOPIC_LEGACY_ATTRIBUTES))
+        if full_republish:
+            _last_full_publish = now
+        logger.info(f"Publicación MQTT completada con éxito ({len(_pending)} mensajes).")
+        return True
         
     except Exception as e:
+        # Forzar republicación completa en el próximo ciclo
+        _session_reset.set()
         logger.error(f"Error publicando en MQTT: {e}")
+        return False
@@ -24,14 +24,13 @@ Environment Variables:
     MQTT_ENABLED: Si "true", habilita publicación MQTT
 """
 import schedule
-import time
 import random
-import subprocess
 import os
-import sys
+import signal
 import threading
 import logging
 import json
+from bisect import bisect_left
 from datetime import datetime, date
 
 from config import OUTPUT_JSON
@@ -54,7 +53,8 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 from http_server import start_http_server
-from mqtt_publisher import publish_to_mqtt
+from mqtt_publisher import publish_to_mqtt, republish_due
+from main import main as run_main
 
 
 # =============================================================================
@@ -64,8 +64,32 @@ from mqtt_publisher import publish_to_mqtt
 SCHEDULE_HOURS_RAW = os.getenv("SCHEDULE_HOURS", "07:00,20:00")
 """Horarios de ejecución del scraper, separados por coma."""
 
-SCHEDULE_HOURS = [h.strip() for h in SCHEDULE_HOURS_RAW.split(",") if h.strip()]
-"""Lista de horarios parseados."""
+def _parse_schedule_hours(raw: str) -> list[str]:
+    """
+    Valida y normaliza los horarios configurados (una sola vez, al cargar).
+    
+    Args:
+        raw: Horarios "HH:MM" separados por coma.
+        
+    Returns:
+        list[str]: Horarios válidos normalizados a "HH:MM" (ej: "7:00" → "07:00").
+    """
+    hours = []
+    for h_str in (h.strip() for h in raw.split(",")):
+        if not h_str:
+            continue
+        try:
+            hours.append(datetime.strptime(h_str, "%H:%M").strftime("%H:%M"))
+        except ValueError as e:
+            logger.error(f"Error con horario '{h_str}': {e}")
+    return hours
+
+
+SCHEDULE_HOURS = _parse_schedule_hours(SCHEDULE_HOURS_RAW)
+"""Lista de horarios válidos, normalizados a "HH:MM"."""
+
+SCHEDULE_MINUTES = sorted(int(h[:2]) * 60 + int(h[3:]) for h in SCHEDULE_HOURS)
+"""Horarios como minutos desde medianoche, ordenados (para bisect)."""
 
 RANDOM_DELAY_MIN = int(os.getenv("RANDOM_DELAY_MIN", "30"))
 """Minutos máximos de delay aleatorio (jitter)."""
@@ -76,6 +100,16 @@ STATE_FILE = "data/last_run.txt"
 MQTT_ENABLED = os.getenv("MQTT_ENABLED", "false").lower() == "true"
 """Flag para habilitar/deshabilitar MQTT."""
 
+_stop = threading.Event()
+"""Se activa con SIGTERM (docker stop): corta las esperas y termina el bucle."""
+
+_last_published_key: tuple[int, int] | None = None
+"""(st_mtime_ns, st_size) de OUTPUT_JSON en la última publicación MQTT exitosa."""
+
+_json_cache: tuple[tuple[int, int], dict] | None = None
+"""Último OUTPUT_JSON parseado, con su (st_mtime_ns, st_size): las
+   republicaciones periódicas no vuelven a leerlo si no cambió."""
+
 
 # =============================================================================
 # FUNCIONES DE SCRAPING
@@ -85,12 +119,14 @@ def run_scraper() -> None:
     """
     Ejecuta el script principal de scraping.
     
-    Invoca main.py como subproceso, publica a MQTT si está habilitado,
-    y guarda el timestamp de la ejecución exitosa.
+    Llama a main.main() en el mismo proceso (sin arrancar un intérprete
+    nuevo ni reimportar selenium y los módulos de bancos en cada corrida),
+    publica a MQTT si está habilitado, y guarda el timestamp de la
+    ejecución exitosa.
     """
     logger.info("Iniciando trabajo de scraping...")
     try:
-        subprocess.run([sys.executable, "main.py"], check=True)
+        run_main()
         
         # Publicar a MQTT si está habilitado
         if MQTT_ENABLED:
@@ -101,7 +137,9 @@ def run_scraper() -> None:
         with open(STATE_FILE, "w") as f:
             f.write(datetime.now().isoformat())
             
-    except Exception as e:
+    except (Exception, SystemExit) as e:
+        # SystemExit: main() aborta así si falta configuración (ej: BANKS);
+        # en el mismo proceso no debe terminar el scheduler
         logger.error(f"Trabajo falló: {e}")
 
 
@@ -111,17 +149,28 @@ def publish_mqtt_task() -> None:
     
     Lee el JSON cacheado y lo publica al broker MQTT.
     Esto asegura que Home Assistant tenga datos actualizados
-    incluso si se reinicia.
+    incluso si se reinicia. Si el archivo no cambió (mismo mtime y
+    tamaño) desde la última publicación exitosa y no toca republicar
+    todo, no se publica nada; y si toca, se reusa el JSON ya parseado.
     """
+    global _last_published_key, _json_cache
+
     if not MQTT_ENABLED:
         return
-    if not os.path.exists(OUTPUT_JSON):
+    try:
+        st = os.stat(OUTPUT_JSON)
+    except FileNotFoundError:
+        return
+    key = (st.st_mtime_ns, st.st_size)
+    if key == _last_published_key and not republish_due():
         return
     
     try:
-        with open(OUTPUT_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        publish_to_mqtt(data)
+        if _json_cache is None or _json_cache[0] != key:
+            with open(OUTPUT_JSON, "r", encoding="utf-8") as f:
+                _json_cache = (key, json.load(f))
+        if publish_to_mqtt(_json_cache[1]):
+            _last_published_key = key
     except Exception as e:
         logger.error(f"Error en publish_mqtt_task: {e}")
 
@@ -140,7 +189,8 @@ def job_wrapper() -> None:
     """
     delay_sec = random.randint(0, RANDOM_DELAY_MIN * 60)
     logger.info(f"Hora programada alcanzada. Esperando {delay_sec}s para aleatoriedad...")
-    time.sleep(delay_sec)
+    if _stop.wait(delay_sec):
+        return  # Detención solicitada durante el jitter
     run_scraper()
 
 
@@ -151,19 +201,20 @@ def check_missed_runs() -> None:
     Si la última ejecución fue ayer y ya pasó algún horario programado
     de hoy, ejecuta inmediatamente para recuperar los datos.
     """
-    if not os.path.exists(STATE_FILE):
-        return
-    
     try:
         with open(STATE_FILE, "r") as f:
             last_run_iso = f.read().strip()
+    except FileNotFoundError:
+        return  # Nunca corrió: nada que recuperar
+    
+    try:
         last_run = datetime.fromisoformat(last_run_iso)
         
         # Si la última ejecución fue antes de hoy
         if last_run.date() < date.today():
-            now_str = datetime.now().strftime("%H:%M")
-            # Y ya pasó algún horario programado
-            if any(now_str > h for h in SCHEDULE_HOURS):
+            now = datetime.now()
+            # Y ya pasó algún horario programado (alguno anterior a ahora)
+            if bisect_left(SCHEDULE_MINUTES, now.hour * 60 + now.minute) > 0:
                 logger.warning(f"Ejecución perdida detectada (Última: {last_run}). Corriendo ahora.")
                 run_scraper()
                  
@@ -171,6 +222,17 @@ def check_missed_runs() -> None:
         logger.error(f"Error verificando ejecuciones perdidas: {e}")
 
 
+def _handle_sigterm(signum, frame) -> None:
+    """
+    Handler de SIGTERM: pide la detención ordenada del scheduler.
+    
+    Como PID 1 del contenedor, sin handler Python ignora SIGTERM y
+    docker stop termina en SIGKILL tras el timeout.
+    """
+    logger.info("SIGTERM recibido. Deteniendo scheduler...")
+    _stop.set()
+
+
 # =============================================================================
 # PUNTO DE ENTRADA
 # =============================================================================
@@ -183,20 +245,20 @@ def main() -> None:
     trabajos programados, y entra en el bucle principal que
     ejecuta los trabajos pendientes.
     """
+    # Registrar SIGTERM antes de cualquier trabajo: docker stop durante el
+    # scraping de recuperación inicial también debe detener el scheduler
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    
     logger.info(f"Scheduler iniciado. Horas: {SCHEDULE_HOURS}, Jitter: +{RANDOM_DELAY_MIN}m")
     
     # Iniciar servidor HTTP en hilo daemon
     http_thread = threading.Thread(target=start_http_server, daemon=True)
     http_thread.start()
     
-    # Programar trabajos para cada horario configurado
+    # Programar trabajos para cada horario configurado (ya validados al cargar)
     for h_str in SCHEDULE_HOURS:
-        try:
-            datetime.strptime(h_str, "%H:%M")  # Validar formato
-            logger.info(f"Programando trabajo para las {h_str} (+0-{RANDOM_DELAY_MIN}m espera)")
-            schedule.every().day.at(h_str).do(job_wrapper)
-        except ValueError as e:
-            logger.error(f"Error con horario '{h_str}': {e}")
+        logger.info(f"Programando trabajo para las {h_str} (+0-{RANDOM_DELAY_MIN}m espera)")
+        schedule.every().day.at(h_str).do(job_wrapper)
             
     # Verificar ejecuciones perdidas al iniciar
     check_missed_runs()
@@ -206,14 +268,16 @@ def main() -> None:
         schedule.every(60).seconds.do(publish_mqtt_task)
         publish_mqtt_task()  # Publicar inmediatamente al iniciar
     
-    # Bucle principal
-    while True:
+    # Bucle principal: esperas interrumpibles por SIGTERM
+    while not _stop.is_set():
         try:
             n = schedule.idle_seconds()
             if n is None:
-                time.sleep(60)
+                _stop.wait(60)
             elif n > 0:
-                time.sleep(n)
+                _stop.wait(n)
+            if _stop.is_set():
+                break
             
             schedule.run_pending()
             
@@ -222,7 +286,8 @@ def main() -> None:
             break
         except Exception as e:
             logger.error(f"Error en bucle principal: {e}")
-            time.sleep(60)
+            _stop.wait(60)
+    logger.info("Scheduler detenido.")
 
 
 if __name__ == "__main__":
@@ -29,14 +29,26 @@ Requisitos:
 """
 from __future__ import annotations
 
+import sys
+
+# Atajo para --generate-key: se resuelve antes del resto de imports y de la
+# configuración del módulo, que solo necesita el flujo interactivo.
+if __name__ == "__main__" and sys.argv[1:2] == ["--generate-key"]:
+    from cryptography.fernet import Fernet
+
+    print("\n🔑 Nueva CREDS_KEY generada:")
+    print("─" * 45)
+    print(Fernet.generate_key().decode("utf-8"))
+    print("─" * 45)
+    print("📋 Copia esta clave a tu archivo .env\n")
+    sys.exit(0)
+
 import ast
 import getpass
 import json
 import os
-import pkgutil
 import re
 import subprocess
-import sys
 from pathlib import Path
 
 from cryptography.fernet import Fernet
@@ -55,6 +67,13 @@ BANKS_PKG = "banks"
 CREDSTORE_DIR = Path(os.getenv("CREDENTIALS_DIRECTORY", "/etc/credstore/bank_scraper"))
 """Directorio donde se guardan las credenciales cifradas."""
 
+_SUDO_INSTALL_SCRIPT = 'install -d -m 700 "$1" && install -m 600 /dev/stdin "$2"'
+"""Script para sudo sh -c: crea el directorio (700) e instala el archivo (600)."""
+
+_METADATA_CACHE: dict[tuple[str, int], tuple[str, list[dict]]] = {}
+"""Metadatos ya leídos por (módulo, st_mtime_ns): reconfigurar un banco
+   en la misma sesión no vuelve a leer ni parsear su archivo."""
+
 
 # =============================================================================
 # UTILIDADES DE ENTORNO
@@ -103,59 +122,49 @@ def require_env(name: str) -> str:
 # FUNCIONES DE CIFRADO FERNET
 # =============================================================================
 
-def generate_fernet_key() -> str:
+def make_cipher(key: str) -> Fernet:
     """
-    Genera una nueva clave Fernet.
+    Construye el cifrador Fernet a partir de CREDS_KEY.
     
-    La clave es URL-safe base64 de 32 bytes, compatible con
-    el algoritmo AES-128-CBC.
-    
-    Returns:
-        str: Clave Fernet como string.
-    """
-    return Fernet.generate_key().decode("utf-8")
-
-
-def validate_fernet_key(key: str) -> bool:
-    """
-    Verifica si una clave es válida para Fernet.
+    Se llama una sola vez al inicio, así una clave inválida se detecta
+    antes de pedir credenciales y el mismo cifrador se reusa para cada
+    banco configurado.
     
     Args:
-        key: Clave a validar.
+        key: Clave Fernet.
         
     Returns:
-        bool: True si la clave es válida, False si no.
+        Fernet: Cifrador listo para usar.
+        
+    Raises:
+        SystemExit: Si la clave no es válida.
     """
     try:
-        Fernet(key.encode("utf-8"))
-        return True
+        return Fernet(key.encode("utf-8"))
     except (ValueError, TypeError):
-        return False
+        raise SystemExit(
+            "\n❌ ERROR: CREDS_KEY no es una clave Fernet válida.\n\n"
+            "Las claves Fernet deben ser generadas con el comando:\n"
+            "  python setup.py --generate-key\n\n"
+            "Luego, copia la clave generada a tu archivo .env"
+        ) from None
 
 
-def encrypt_fernet(text: str, key: str) -> str:
+def encrypt_fernet(data: bytes, cipher: Fernet) -> bytes:
     """
-    Cifra texto usando Fernet (AES-128-CBC + HMAC).
+    Cifra datos usando Fernet (AES-128-CBC + HMAC).
+    
+    Trabaja en bytes de punta a punta (Fernet cifra y devuelve bytes),
+    sin conversiones intermedias a str.
     
     Args:
-        text: Texto a cifrar.
-        key: Clave Fernet.
+        data: Datos a cifrar.
+        cipher: Cifrador Fernet (ver make_cipher()).
         
     Returns:
-        str: Texto cifrado como string URL-safe base64.
-        
-    Raises:
-        SystemExit: Si la clave no es válida.
+        bytes: Token cifrado (URL-safe base64, ASCII).
     """
-    if not validate_fernet_key(key):
-        raise SystemExit(
-            "\n❌ ERROR: CREDS_KEY no es una clave Fernet válida.\n\n"
-            "Las claves Fernet deben ser generadas con el comando:\n"
-            "  python setup.py --generate-key\n\n"
-            "Luego, copia la clave generada a tu archivo .env"
-        )
-    cipher = Fernet(key.encode("utf-8"))
-    return cipher.encrypt(text.encode("utf-8")).decode("utf-8")
+    return cipher.encrypt(data)
 
 
 # =============================================================================
@@ -177,13 +186,16 @@ def list_bank_modules() -> list[str]:
     pkg_path = PROJECT_ROOT / BANKS_PKG
     if not pkg_path.exists():
         raise SystemExit(f"No existe carpeta {BANKS_PKG}/ en {PROJECT_ROOT}")
+    # scandir directo: solo nombres de archivos .py, sin armar ModuleSpecs
     mods = []
-    for m in pkgutil.iter_modules([str(pkg_path)]):
-        if m.ispkg:
-            continue
-        if m.name.startswith("_") or m.name in ("common", "__init__", "bank_template"):
-            continue
-        mods.append(m.name)
+    with os.scandir(pkg_path) as entries:
+        for entry in entries:
+            name, ext = os.path.splitext(entry.name)
+            if ext != ".py" or not entry.is_file():
+                continue
+            if name.startswith("_") or name in ("common", "__init__", "bank_template"):
+                continue
+            mods.append(name)
     return sorted(mods)
 
 
@@ -192,7 +204,8 @@ def load_bank_metadata(bank_module: str) -> tuple[str, list[dict]]:
     Lee BANK_KEY y CREDENTIAL_FIELDS desde un módulo de banco.
     
     Usa AST para parsear el archivo sin importarlo, evitando
-    dependencias de selenium/venv.
+    dependencias de selenium/venv. El resultado se cachea por mtime
+    del archivo.
     
     Args:
         bank_module: Nombre del módulo (sin extensión).
@@ -204,10 +217,17 @@ def load_bank_metadata(bank_module: str) -> tuple[str, list[dict]]:
         SystemExit: Si el archivo no existe o no define CREDENTIAL_FIELDS.
     """
     path = PROJECT_ROOT / BANKS_PKG / f"{bank_module}.py"
-    if not path.exists():
-        raise SystemExit(f"No existe: {path}")
+    try:
+        cache_key = (bank_module, path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        raise SystemExit(f"No existe: {path}") from None
+    cached = _METADATA_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
 
-    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    # Bytes: ast.parse detecta la codificación (PEP 263) sin decodificar
+    # el archivo antes
+    tree = ast.parse(path.read_bytes(), filename=str(path))
 
     bank_key = None
     cred_fields = None
@@ -225,6 +245,7 @@ def load_bank_metadata(bank_module: str) -> tuple[str, list[dict]]:
     if not cred_fields:
         raise SystemExit(f"{bank_module}.py no define CREDENTIAL_FIELDS")
 
+    _METADATA_CACHE[cache_key] = (bank_key, cred_fields)
     return bank_key, cred_fields
 
 
@@ -249,14 +270,17 @@ def pick_bank(mods: list[str]) -> str | None:
     Returns:
         str: Nombre del módulo seleccionado, o None para salir.
     """
-    print("\n┌─────────────────────────────────────┐")
-    print("│       📋 BANCOS DISPONIBLES         │")
-    print("├─────────────────────────────────────┤")
-    for i, m in enumerate(mods, start=1):
-        print(f"│   {i}) {m:<30} │")
-    print("├─────────────────────────────────────┤")
-    print("│   0) Salir                          │")
-    print("└─────────────────────────────────────┘")
+    # Armar el menú completo y emitirlo en una sola escritura
+    menu = [
+        "\n┌─────────────────────────────────────┐",
+        "│       📋 BANCOS DISPONIBLES         │",
+        "├─────────────────────────────────────┤",
+        *(f"│   {i}) {m:<30} │" for i, m in enumerate(mods, start=1)),
+        "├─────────────────────────────────────┤",
+        "│   0) Salir                          │",
+        "└─────────────────────────────────────┘",
+    ]
+    print("\n".join(menu), flush=True)
     
     while True:
         choice = input("\n👉 Seleccione una opción: ").strip()
@@ -293,8 +317,9 @@ def prompt_fields_from_metadata(bank_key: str, fields: list[dict]) -> dict:
         name = f["name"]
         prompt = f.get("prompt", name)
         secret = bool(f.get("secret", False))
-        pattern = f.get("pattern")
-        min_len = f.get("min_len")
+        # Compilar el patrón y convertir min_len una vez por campo, no por reintento
+        pattern = re.compile(f["pattern"]) if f.get("pattern") else None
+        min_len = int(f["min_len"]) if f.get("min_len") is not None else None
 
         while True:
             if secret:
@@ -302,11 +327,11 @@ def prompt_fields_from_metadata(bank_key: str, fields: list[dict]) -> dict:
             else:
                 val = input(f"   📄 {prompt}: ").strip()
 
-            if min_len is not None and len(val) < int(min_len):
+            if min_len is not None and len(val) < min_len:
                 print(f"      ⚠️  Valor demasiado corto (mínimo {min_len})")
                 continue
 
-            if pattern and not re.match(pattern, val):
+            if pattern is not None and not pattern.match(val):
                 print("      ⚠️  Formato inválido")
                 continue
 
@@ -324,7 +349,7 @@ def prompt_fields_from_metadata(bank_key: str, fields: list[dict]) -> dict:
 # ESCRITURA DE CREDENCIALES
 # =============================================================================
 
-def write_credstore_file(path: Path, content: str) -> None:
+def write_credstore_file(path: Path, content: bytes) -> None:
     """
     Escribe un archivo de credencial con permisos seguros.
     
@@ -338,28 +363,27 @@ def write_credstore_file(path: Path, content: str) -> None:
     Raises:
         PermissionError: Si no hay permisos y sudo no está disponible.
     """
-    # Intentar escritura directa
+    # Intentar escritura directa, creando el archivo ya con 600 (sin una
+    # ventana con los permisos por defecto antes del chmod)
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content, encoding="utf-8")
-        path.chmod(0o600)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(fd, 0o600)  # Por si ya existía con otros permisos
+            f.write(content)
         return
     except PermissionError:
         pass
 
-    # Intentar con sudo
+    # Intentar con sudo: una sola invocación crea el directorio e instala
+    # el archivo leyendo el contenido por stdin (sin archivo temporal)
     import shutil
     if shutil.which("sudo"):
-        tmp = Path("/tmp") / f"{path.name}.tmp"
-        tmp.write_text(content, encoding="utf-8")
-        try:
-            subprocess.run(["sudo", "install", "-d", "-m", "700", str(path.parent)], check=True)
-            subprocess.run(["sudo", "install", "-m", "600", str(tmp), str(path)], check=True)
-        finally:
-            try:
-                tmp.unlink()
-            except Exception:
-                pass
+        subprocess.run(
+            ["sudo", "sh", "-c", _SUDO_INSTALL_SCRIPT, "sh", str(path.parent), str(path)],
+            input=content,
+            check=True,
+        )
     else:
         raise PermissionError(
             f"No tengo permisos para escribir en {path} y 'sudo' no está instalado. "
@@ -371,7 +395,7 @@ def write_credstore_file(path: Path, content: str) -> None:
 # LÓGICA PRINCIPAL
 # =============================================================================
 
-def configure_bank(mods: list[str], key: str) -> bool:
+def configure_bank(mods: list[str], cipher: Fernet) -> bool:
     """
     Configura las credenciales de un banco.
     
@@ -379,7 +403,7 @@ def configure_bank(mods: list[str], key: str) -> bool:
     
     Args:
         mods: Lista de módulos de banco disponibles.
-        key: Clave Fernet para cifrado.
+        cipher: Cifrador Fernet (construido una vez en main()).
         
     Returns:
         bool: True si se configuró un banco, False si el usuario salió.
@@ -391,8 +415,8 @@ def configure_bank(mods: list[str], key: str) -> bool:
     bank_key, cred_fields = load_bank_metadata(bank_module)
     payload_obj = prompt_fields_from_metadata(bank_key, cred_fields)
 
-    json_text = json.dumps(payload_obj, separators=(",", ":"))
-    encrypted = encrypt_fernet(json_text, key)
+    json_bytes = json.dumps(payload_obj, separators=(",", ":")).encode("utf-8")
+    encrypted = encrypt_fernet(json_bytes, cipher)
 
     cred_name = f"{bank_key}_creds"
     dest = CREDSTORE_DIR / cred_name
@@ -411,7 +435,7 @@ def main() -> None:
     del menú de configuración.
     """
     load_env_simple(PROJECT_ROOT / ".env")
-    key = require_env("CREDS_KEY")
+    cipher = make_cipher(require_env("CREDS_KEY"))
 
     mods = list_bank_modules()
     if not mods:
@@ -421,7 +445,7 @@ def main() -> None:
     
     # Loop principal del menú
     while True:
-        if not configure_bank(mods, key):
+        if not configure_bank(mods, cipher):
             break
         
         print("\n" + "─" * 45)
@@ -435,13 +459,5 @@ def main() -> None:
 # =============================================================================
 
 if __name__ == "__main__":
-    # Subcomando para generar clave
-    if len(sys.argv) > 1 and sys.argv[1] == "--generate-key":
-        print("\n🔑 Nueva CREDS_KEY generada:")
-        print("─" * 45)
-        print(generate_fernet_key())
-        print("─" * 45)
-        print("📋 Copia esta clave a tu archivo .env\n")
-        sys.exit(0)
-    
+    # --generate-key se atiende al inicio del archivo, antes de los imports
     main()
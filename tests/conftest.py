@@ -0,0 +1,8 @@
+"""
+Configuración de pytest: permite importar los módulos del proyecto
+(banks, main, ...) desde la raíz del repositorio.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,91 @@
+"""
+Tests de banks.common: parseo de montos.
+
+_parse_number reemplazó al parseo original basado en regex; estos casos
+comparan ambos resultados para asegurar que el comportamiento no cambió.
+"""
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from banks.common import _parse_number, parse_amount
+
+
+def _baseline_number(raw: str) -> float | None:
+    """Parseo original de parse_amount (regex + float con try/except)."""
+    s = (raw or "").strip()
+    if not s:
+        return None
+    try:
+        match = re.search(r"[\d.,]+", s)
+        if not match:
+            return None
+        num_str = match.group()
+        if "," in num_str and "." in num_str:
+            if num_str.rfind(",") > num_str.rfind("."):
+                num_str = num_str.replace(".", "").replace(",", ".")
+            else:
+                num_str = num_str.replace(",", "")
+        elif "," in num_str:
+            num_str = num_str.replace(",", ".")
+        return float(num_str)
+    except Exception:
+        return None
+
+
+CASES = [
+    # Formato uruguayo
+    ("1.234,56", 1234.56),
+    ("$ 1.234,56", 1234.56),
+    ("US$ 100,00", 100.0),
+    ("$ 5,40", 5.4),
+    ("1.234.567,89", 1234567.89),
+    # Formato americano
+    ("1,234.56", 1234.56),
+    ("1,234,567.89", 1234567.89),
+    # Solo punto: decimal directo
+    ("1234.56", 1234.56),
+    ("$ 0.5", 0.5),
+    # Enteros y separadores en los bordes
+    ("1234", 1234.0),
+    ("5,", 5.0),
+    (",5", 0.5),
+    ("5.", 5.0),
+    # Solo el primer bloque numérico cuenta
+    ("$ 1.234,56 (USD 10,00)", 1234.56),
+    ("Saldo: -<AMOUNT> 12,50", 12.5),
+    # Varios puntos sin coma: float() falla, se rechaza
+    ("1.2.3", None),
+    ("1.234.567", None),
+    ("$ 1.234.567", None),
+    # Sin dígitos
+    ("", None),
+    ("   ", None),
+    (None, None),
+    ("$", None),
+    ("---", None),
+    (".", None),
+    (",", None),
+    ("..", None),
+    (".,", None),
+]
+
+
+@pytest.mark.parametrize("raw, expected", CASES)
+def test_parse_number(raw, expected):
+    assert _parse_number(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [raw for raw, _ in CASES])
+def test_parse_number_matches_baseline(raw):
+    assert _parse_number(raw) == _baseline_number(raw)
+
+
+def test_parse_amount_keeps_raw_and_returns_fresh_dict():
+    first = parse_amount("$ 1.234,56")
+    assert first == {"raw": "$ 1.234,56", "number": 1234.56}
+
+    first["number"] = 0
+    assert parse_amount("$ 1.234,56")["number"] == 1234.56
@@ -0,0 +1,25 @@
+"""
+Tests de banks.oca: parseo de montos con detección de moneda.
+"""
+from __future__ import annotations
+
+import pytest
+
+from banks.oca import _parse_money
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("$ 1.234,56", ("UYU", {"raw": "$ 1.234,56", "number": 1234.56})),
+    ("US$ 10,00", ("USD", {"raw": "US$ 10,00", "number": 10.0})),
+    ("Disponible $ 5,40 al día", ("UYU", {"raw": "$ 5,40", "number": 5.4})),
+    ("", ("UYU", {"raw": "", "number": None})),
+    (None, ("UYU", {"raw": None, "number": None})),
+])
+def test_parse_money(raw, expected):
+    assert _parse_money(raw) == expected
+
+
+def test_parse_money_returns_fresh_dict():
+    _, first = _parse_money("US$ 10,00")
+    first["number"] = 0
+    assert _parse_money("US$ 10,00")[1]["number"] == 10.0